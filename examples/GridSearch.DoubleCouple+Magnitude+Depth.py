@@ -11,6 +11,7 @@ from mtuq.grid_search import grid_search
 from mtuq.misfit import Misfit
 from mtuq.process_data import ProcessData
 from mtuq.util import fullpath, merge_dicts, save_json
+from mtuq.util import cache_key, load_cache, save_cache
 from mtuq.util.cap import parse_station_codes, Trapezoid
 
 
@@ -75,6 +76,7 @@ if __name__=='__main__':
         time_shift_min=-2.,
         time_shift_max=+2.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_sw = Misfit(
@@ -82,6 +84,7 @@ if __name__=='__main__':
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['ZR','T'],
+        jit=True,
         )
 
 
@@ -134,7 +137,9 @@ if __name__=='__main__':
         magnitude=4.5)
 
 
+    from concurrent.futures import ThreadPoolExecutor
     from mpi4py import MPI
+    from mtuq.util import bcast2, bcast_shared
     comm = MPI.COMM_WORLD
 
 
@@ -154,18 +159,51 @@ if __name__=='__main__':
         stations = data.get_stations()
 
 
+        # processing of body waves and of longer-period waves is
+        # independent, so the two are carried out concurrently
         print('Processing data...\n')
-        data_bw = data.map(process_bw)
-        data_sw = data.map(process_sw)
-
-
-        print('Reading Greens functions...\n')
-        greens = download_greens_tensors(stations, origins, model)
-
-        print('Processing Greens functions...\n')
-        greens.convolve(wavelet)
-        greens_bw = greens.map(process_bw)
-        greens_sw = greens.map(process_sw)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            data_bw, data_sw = executor.map(
+                data.map, [process_bw, process_sw])
+
+
+        # processed Greens functions are saved to disk, so that later runs
+        # with the same stations, origins, model, wavelet and data processing
+        # parameters can skip reading and processing
+        key = cache_key(
+            stations, origins, model, wavelet, process_bw, process_sw)
+
+        try:
+            greens_bw, greens_sw = load_cache(key)
+
+        except FileNotFoundError:
+            print('Reading Greens functions...\n')
+            greens = download_greens_tensors(stations, origins, model)
+
+            print('Processing Greens functions...\n')
+            greens.convolve(wavelet)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                greens_bw, greens_sw = executor.map(
+                    greens.map, [process_bw, process_sw])
+
+            # saved in single precision, so that later runs can use the
+            # memory-mapped cache files as they are
+            for container in [greens_bw, greens_sw]:
+                for stream in container:
+                    for trace in stream:
+                        trace.data = np.ascontiguousarray(
+                            trace.data, dtype=np.float32)
+
+            save_cache(key, (greens_bw, greens_sw))
+
+        # single precision suffices for processed waveforms and halves the
+        # volume of data broadcast to other ranks
+        for container in [data_bw, data_sw, greens_bw, greens_sw]:
+            for stream in container:
+                for trace in stream:
+                    if trace.data.dtype != np.float32:
+                        trace.data = np.ascontiguousarray(
+                            trace.data, dtype=np.float32)
 
 
     else:
@@ -176,11 +214,14 @@ if __name__=='__main__':
         greens_sw = None
 
 
+    # numeric trace data are broadcast as contiguous arrays, avoiding the
+    # overhead of pickling large containers; Greens functions, the largest
+    # of these, are held only once per node in shared memory
     stations = comm.bcast(stations, root=0)
-    data_bw = comm.bcast(data_bw, root=0)
-    data_sw = comm.bcast(data_sw, root=0)
-    greens_bw = comm.bcast(greens_bw, root=0)
-    greens_sw = comm.bcast(greens_sw, root=0)
+    data_bw = bcast2(comm, data_bw, root=0)
+    data_sw = bcast2(comm, data_sw, root=0)
+    greens_bw = bcast_shared(comm, greens_bw, root=0)
+    greens_sw = bcast_shared(comm, greens_sw, root=0)
 
 
     #
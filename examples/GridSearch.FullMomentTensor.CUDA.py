@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from mtuq import read, download_greens_tensors
+from mtuq.event import Origin
+from mtuq.graphics import plot_data_greens2, plot_beachball, plot_misfit_lune
+from mtuq.grid import FullMomentTensorGridSemiregular
+from mtuq.grid_search import grid_search
+from mtuq.misfit import Misfit
+from mtuq.process_data import ProcessData
+from mtuq.util import fullpath, merge_dicts, save_json
+from mtuq.util import cache_key, load_cache, save_cache
+from mtuq.util.cap import parse_station_codes, Trapezoid
+
+
+
+if __name__=='__main__':
+    #
+    # Carries out grid search over all moment tensor parameters, evaluating
+    # misfit on a CUDA device
+    #
+    # USAGE
+    #   mpirun -n <NPROC> python GridSearch.FullMomentTensor.CUDA.py
+    #
+    # Requires CuPy; without it, misfit evaluation falls back to the
+    # C extension. All MPI processes on a node share its default CUDA
+    # device, so a small number of processes usually suffices
+    #
+
+
+    path_data=    fullpath('data/examples/20090407201255351/*.[zrt]')
+    path_weights= fullpath('data/examples/20090407201255351/weights.dat')
+    event_id=     '20090407201255351'
+    model=        'ak135'
+
+
+    #
+    # Body and surface wave measurements will be made separately
+    #
+
+    process_bw = ProcessData(
+        filter_type='Bandpass',
+        freq_min= 0.1,
+        freq_max= 0.333,
+        pick_type='taup',
+        taup_model=model,
+        window_type='body_wave',
+        window_length=15.,
+        capuaf_file=path_weights,
+        )
+
+    process_sw = ProcessData(
+        filter_type='Bandpass',
+        freq_min=0.025,
+        freq_max=0.0625,
+        pick_type='taup',
+        taup_model=model,
+        window_type='surface_wave',
+        window_length=150.,
+        capuaf_file=path_weights,
+        )
+
+
+    #
+    # For our objective function, we will use a sum of body and surface wave
+    # contributions
+    #
+
+    misfit_bw = Misfit(
+        norm='L2',
+        time_shift_min=-2.,
+        time_shift_max=+2.,
+        time_shift_groups=['ZR'],
+        gpu=True,
+        )
+
+    misfit_sw = Misfit(
+        norm='L2',
+        time_shift_min=-10.,
+        time_shift_max=+10.,
+        time_shift_groups=['ZR','T'],
+        gpu=True,
+        )
+
+
+    #
+    # User-supplied weights control how much each station contributes to the
+    # objective function
+    #
+
+    station_id_list = parse_station_codes(path_weights)
+
+
+    #
+    # Next, we specify the moment tensor grid and source-time function
+    # (about one million grid points, a problem size for which GPU
+    # misfit evaluation pays off)
+    #
+
+    grid = FullMomentTensorGridSemiregular(
+        npts_per_axis=10,
+        magnitudes=[4.3, 4.4, 4.5, 4.6, 4.7])
+
+    wavelet = Trapezoid(
+        magnitude=4.5)
+
+
+    #
+    # Origin time and location will be fixed. For an example in which they 
+    # vary, see examples/GridSearch.DoubleCouple+Magnitude+Depth.py
+    #
+    # See also Dataset.get_origins(), which attempts to create Origin objects
+    # from waveform metadata
+    #
+
+    origin = Origin({
+        'time': '2009-04-07T20:12:55.000000Z',
+        'latitude': 61.454200744628906,
+        'longitude': -149.7427978515625,
+        'depth_in_m': 33033.599853515625,
+        })
+
+
+    from concurrent.futures import ThreadPoolExecutor
+    from mpi4py import MPI
+    from mtuq.util import bcast2, bcast_shared
+    comm = MPI.COMM_WORLD
+
+
+    #
+    # The main I/O work starts now
+    #
+
+    if comm.rank==0:
+        print('Reading data...\n')
+        data = read(path_data, format='sac', 
+            event_id=event_id,
+            station_id_list=station_id_list,
+            tags=['units:cm', 'type:velocity']) 
+
+
+        data.sort_by_distance()
+        stations = data.get_stations()
+
+
+        # processing of body waves and of longer-period waves is
+        # independent, so the two are carried out concurrently
+        print('Processing data...\n')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            data_bw, data_sw = executor.map(
+                data.map, [process_bw, process_sw])
+
+
+        # processed Greens functions are saved to disk, so that later runs
+        # with the same stations, origin, model, wavelet and data processing
+        # parameters can skip reading and processing
+        key = cache_key(
+            stations, origin, model, wavelet, process_bw, process_sw)
+
+        try:
+            greens_bw, greens_sw = load_cache(key)
+
+        except FileNotFoundError:
+            print('Reading Greens functions...\n')
+            greens = download_greens_tensors(stations, origin, model)
+
+            print('Processing Greens functions...\n')
+            greens.convolve(wavelet)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                greens_bw, greens_sw = executor.map(
+                    greens.map, [process_bw, process_sw])
+
+            # saved in single precision, so that later runs can use the
+            # memory-mapped cache files as they are
+            for container in [greens_bw, greens_sw]:
+                for stream in container:
+                    for trace in stream:
+                        trace.data = np.ascontiguousarray(
+                            trace.data, dtype=np.float32)
+
+            save_cache(key, (greens_bw, greens_sw))
+
+        # single precision suffices for processed waveforms and halves the
+        # volume of data broadcast to other ranks
+        for container in [data_bw, data_sw, greens_bw, greens_sw]:
+            for stream in container:
+                for trace in stream:
+                    if trace.data.dtype != np.float32:
+                        trace.data = np.ascontiguousarray(
+                            trace.data, dtype=np.float32)
+
+
+    else:
+        stations = None
+        data_bw = None
+        data_sw = None
+        greens_bw = None
+        greens_sw = None
+
+
+    # numeric trace data are broadcast as contiguous arrays, avoiding the
+    # overhead of pickling large containers; Greens functions, the largest
+    # of these, are held only once per node in shared memory
+    stations = comm.bcast(stations, root=0)
+    data_bw = bcast2(comm, data_bw, root=0)
+    data_sw = bcast2(comm, data_sw, root=0)
+    greens_bw = bcast_shared(comm, greens_bw, root=0)
+    greens_sw = bcast_shared(comm, greens_sw, root=0)
+
+
+    #
+    # The main computational work starts now
+    #
+
+    if comm.rank==0:
+        print('Evaluating body wave misfit...\n')
+
+    results_bw = grid_search(
+        data_bw, greens_bw, misfit_bw, origin, grid)
+
+    if comm.rank==0:
+        print('Evaluating surface wave misfit...\n')
+
+    results_sw = grid_search(
+        data_sw, greens_sw, misfit_sw, origin, grid)
+
+
+
+    if comm.rank==0:
+
+        results = results_bw + results_sw
+
+        # `grid` index corresponding to minimum misfit
+        idx = results.source_idxmin()
+
+        best_mt = grid.get(idx)
+        lune_dict = grid.get_dict(idx)
+        mt_dict = best_mt.as_dict()
+
+
+        #
+        # Generate figures and save results
+        #
+
+        print('Generating figures...\n')
+
+        plot_data_greens2(event_id+'FMT_waveforms.png',
+            data_bw, data_sw, greens_bw, greens_sw, process_bw, process_sw, 
+            misfit_bw, misfit_sw, stations, origin, best_mt, lune_dict)
+
+
+        plot_beachball(event_id+'FMT_beachball.png',
+            best_mt, stations, origin)
+
+
+        plot_misfit_lune(event_id+'FMT_misfit.png', results)
+
+
+        print('Saving results...\n')
+
+        # collect information about best-fitting source
+        merged_dict = merge_dicts(
+            mt_dict,
+            lune_dict,
+            {'M0': best_mt.moment()},
+            {'Mw': best_mt.magnitude()},
+            origin,
+            )
+
+        # save best-fitting source
+        save_json(event_id+'FMT_solution.json', merged_dict)
+
+
+        # save misfit surface
+        results.save(event_id+'FMT_misfit.nc')
+
+
+        print('\nFinished\n')
+
@@ -11,6 +11,7 @@ from mtuq.grid_search import grid_search
 from mtuq.misfit import Misfit
 from mtuq.process_data import ProcessData
 from mtuq.util import fullpath, merge_dicts, save_json
+from mtuq.util import cache_key, load_cache, save_cache
 from mtuq.util.cap import parse_station_codes, Trapezoid
 
 
@@ -75,6 +76,7 @@ if __name__=='__main__':
         time_shift_min=-2.,
         time_shift_max=+2.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_sw = Misfit(
@@ -82,6 +84,7 @@ if __name__=='__main__':
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['ZR','T'],
+        jit=True,
         )
 
 
@@ -141,25 +144,59 @@ if __name__=='__main__':
     data_sw = data.map(process_sw)
 
 
-    print('Reading Greens functions...\n')
-    greens = download_greens_tensors(stations, origin, model)
+    # processed Greens functions are saved to disk, so that later runs
+    # with the same stations, origin, model, wavelet and data processing
+    # parameters can skip reading and processing
+    key = cache_key(
+        stations, origin, model, wavelet, process_bw, process_sw)
 
+    try:
+        greens_bw, greens_sw = load_cache(key)
 
-    print('Processing Greens functions...\n')
-    greens.convolve(wavelet)
-    greens_bw = greens.map(process_bw)
-    greens_sw = greens.map(process_sw)
+    except FileNotFoundError:
+        print('Reading Greens functions...\n')
+        greens = download_greens_tensors(stations, origin, model)
+
+        print('Processing Greens functions...\n')
+        greens.convolve(wavelet)
+        greens_bw = greens.map(process_bw)
+        greens_sw = greens.map(process_sw)
+
+        # saved in single precision, so that later runs can use the
+        # memory-mapped cache files as they are
+        for container in [greens_bw, greens_sw]:
+            for stream in container:
+                for trace in stream:
+                    trace.data = np.ascontiguousarray(
+                        trace.data, dtype=np.float32)
+
+        save_cache(key, (greens_bw, greens_sw))
+
+
+    # single precision suffices for processed waveforms and halves the
+    # volume of data passed to worker processes
+    for container in [data_bw, data_sw, greens_bw, greens_sw]:
+        for stream in container:
+            for trace in stream:
+                if trace.data.dtype != np.float32:
+                    trace.data = np.ascontiguousarray(
+                        trace.data, dtype=np.float32)
 
 
     #
     # The main computational work starts now
     #
 
+    # without MPI, the grid search can still be divided among all cores
+    # of the local machine
+
     print('Evaluating body wave misfit...\n')
-    results_bw = grid_search(data_bw, greens_bw, misfit_bw, origin, grid)
+    results_bw = grid_search(data_bw, greens_bw, misfit_bw, origin, grid,
+        processes=os.cpu_count())
 
     print('Evaluating surface wave misfit...\n')
-    results_sw = grid_search(data_sw, greens_sw, misfit_sw, origin, grid)
+    results_sw = grid_search(data_sw, greens_sw, misfit_sw, origin, grid,
+        processes=os.cpu_count())
 
 
 
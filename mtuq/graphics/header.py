@@ -6,6 +6,7 @@
 
 import numpy as np
 import os
+from functools import lru_cache
 from matplotlib import pyplot
 from matplotlib.font_manager import FontProperties
 from mtuq.event import MomentTensor
@@ -60,11 +61,11 @@ class TextHeader(Base):
     """
     def __init__(self, items):
         # validates items
-        for item in items:
-            assert len(item) >= 3
-            xp, yp, text  = item[0], item[1], item[2]
-            assert 0. <= xp <= 1.
-            assert 0. <= yp <= 1.
+        assert all(len(item) >= 3 for item in items)
+
+        # checks all positions at once
+        positions = np.array([item[:2] for item in items], dtype=float)
+        assert ((0. <= positions) & (positions <= 1.)).all()
 
         self.items = items
 
@@ -99,7 +100,7 @@ class MomentTensorHeader(Base):
 
         self.event_name = event_name
         self.origin = origin
-        self.magnitude = mt.magnitude()
+        self.magnitude = _magnitude(tuple(mt.as_vector()))
 
         depth_in_m = origin.depth_in_m
         depth_in_km = origin.depth_in_m/1000.
@@ -180,14 +181,7 @@ class MomentTensorHeader(Base):
         xp = offset
         yp = 0.075*height
 
-        plot_beachball('tmp.png', self.mt, None, None)
-        img = pyplot.imread('tmp.png')
-
-        try:
-            os.remove('tmp.png')
-            os.remove('tmp.ps')
-        except:
-            pass
+        img = _beachball_image(tuple(self.mt.as_vector()))
 
         ax.imshow(img, extent=(xp,xp+diameter,yp,yp+diameter))
 
@@ -395,6 +389,30 @@ class ForceHeader(Base):
 
 
 
+#
+# moment tensor summaries are cached, since the same moment tensor is usually
+# displayed in the headers of several figures
+#
+
+@lru_cache(maxsize=1024)
+def _magnitude(mt):
+    return MomentTensor(np.array(mt)).magnitude()
+
+
+@lru_cache(maxsize=32)
+def _beachball_image(mt):
+    plot_beachball('tmp.png', MomentTensor(np.array(mt)), None, None)
+    img = pyplot.imread('tmp.png')
+
+    try:
+        os.remove('tmp.png')
+        os.remove('tmp.ps')
+    except:
+        pass
+
+    return img
+
+
 def _lat_lon(origin):
     if origin.latitude >= 0:
         latlon = '%.2f%s%s' % (+origin.latitude, u'\N{DEGREE SIGN}', 'N')
@@ -444,19 +462,24 @@ def _phi_theta(force_dict):
     return '%s  %s:  %.f  %.f' % (u'\u03C6', u'\u03B8', phi, theta)
 
 
+# font properties are created once and reused for every write (matplotlib
+# copies them into each text object)
+_bold_font = FontProperties()
+#_bold_font.set_weight('bold')
+
+_italic_font = FontProperties()
+_italic_font.set_style('italic')
+
+
 def _write_text(text, x, y, ax, fontsize=12, **kwargs):
     pyplot.text(x, y, text, fontsize=fontsize, **kwargs)
 
 
 def _write_bold(text, x, y, ax, fontsize=14):
-    font = FontProperties()
-    #font.set_weight('bold')
-    pyplot.text(x, y, text, fontproperties=font, fontsize=fontsize)
+    pyplot.text(x, y, text, fontproperties=_bold_font, fontsize=fontsize)
 
 
 def _write_italic(text, x, y, ax, fontsize=12):
-    font = FontProperties()
-    font.set_style('italic')
-    pyplot.text(x, y, text, fontproperties=font, fontsize=fontsize)
+    pyplot.text(x, y, text, fontproperties=_italic_font, fontsize=fontsize)
 
 
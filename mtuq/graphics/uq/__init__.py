@@ -1,5 +1,16 @@
 
 import numpy as np
+import pandas
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import dask.array
+except ImportError:
+    dask = None
 
 from mtuq.grid_search import DataArray, DataFrame, MTUQDataArray, MTUQDataFrame
 from mtuq.util import dataarray_idxmin, dataarray_idxmax, product, warn
@@ -26,6 +37,249 @@ def _nothing_to_plot(values):
         return True
 
 
+def _as_regular(ds):
+    """ Reshapes DataFrame from a regularly-spaced grid into DataArray
+
+    DataFrames tagged as regular by `Grid.to_dataframe` can be plotted in
+    the same way as `grid_search` DataArrays, with no need for binning. Any
+    other input is returned unchanged
+    """
+    if not issubclass(type(ds), DataFrame) or not ds.attrs.get('regular'):
+        return ds
+
+    dims = list(ds.attrs['dims'])
+    coords = [np.array(array) for array in ds.attrs['coords']]
+
+    shape = [len(array) for array in coords]
+    if len(ds) != np.prod(shape):
+        # rows added or removed since tagging
+        return ds
+
+    # attrs survive sorting, filtering and other operations that reorder
+    # rows, so the grid points themselves are checked before reshaping,
+    # one dimension at a time
+    for _i, dim in enumerate(dims):
+        axis = np.reshape(coords[_i], [-1 if _j == _i else 1
+            for _j in range(len(shape))])
+
+        if not np.array_equal(
+            np.reshape(ds[dim].values, shape), np.broadcast_to(axis, shape)):
+            return ds
+
+    return MTUQDataArray(
+        data=np.reshape(ds['values'].values, shape + [1]),
+        dims=tuple(dims) + ('origin_idx',),
+        coords=coords + [np.arange(1)])
+
+
+def _bin2d(x, y, values, edges_x, edges_y, handle):
+    """ Bins scattered values into rectangular cells
+
+    Applies `handle` (a reduction name such as ``'min'``, ``'max'`` or
+    ``'mean'``, or any function accepted by ``pandas.Series.agg``) to the
+    values falling within each cell, returning an array of shape
+    ``(len(edges_x)-1, len(edges_y)-1)``. Empty cells are set to NaN.
+
+    If Numba is installed, the common reductions are carried out by a
+    compiled kernel rather than by pandas.
+    """
+    nx = len(edges_x)-1
+    ny = len(edges_y)-1
+
+    if numba is not None and handle in _bin2d_ops:
+        binned, counts = _bin2d_numba(
+            np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+            np.asarray(values, dtype=float),
+            np.asarray(edges_x, dtype=float), np.asarray(edges_y, dtype=float),
+            _bin2d_ops.index(handle), numba.get_num_threads())
+        nonempty = np.count_nonzero(counts)
+
+    else:
+        binned, nonempty = _bin2d_pandas(
+            x, y, values, edges_x, edges_y, handle)
+
+    if nonempty < nx*ny:
+        print("Encountered empty bin")
+
+    return binned.reshape((nx, ny))
+
+
+def _bin2d_pandas(x, y, values, edges_x, edges_y, handle):
+    """ Scatters values into cells, reducing with `handle` via pandas
+
+    Returns flattened binned values and number of nonempty cells
+    """
+    nx = len(edges_x)-1
+    ny = len(edges_y)-1
+
+    x, y, values = np.asarray(x), np.asarray(y), np.asarray(values)
+
+    # which grid points lie within the binned region?
+    mask = (edges_x[0] <= x) & (x <= edges_x[-1]) &\
+           (edges_y[0] <= y) & (y <= edges_y[-1])
+
+    # which cell does each grid point lie within?
+    ix = np.searchsorted(edges_x, x[mask], side='right') - 1
+    iy = np.searchsorted(edges_y, y[mask], side='right') - 1
+    ix = np.clip(ix, 0, nx-1)
+    iy = np.clip(iy, 0, ny-1)
+
+    # reduce all cells in a single pass
+    reduced = pandas.Series(values[mask]).groupby(ix*ny + iy).agg(handle)
+    binned = np.full(nx*ny, np.nan)
+    binned[reduced.index.values] = reduced.values
+
+    return binned, len(reduced)
+
+
+# reductions supported by the compiled binning kernel
+_bin2d_ops = ('min', 'max', 'sum', 'mean')
+
+
+def _bin2d_kernel(x, y, values, edges_x, edges_y, op, nchunks):
+    """ Scatters values into cells, reducing with `_bin2d_ops[op]`
+
+    Each chunk of input reduces into its own tile, so chunks can run in
+    parallel without atomics; tiles are combined at the end. As with
+    pandas, NaN values are skipped
+    """
+    n = len(values)
+    nx = len(edges_x)-1
+    ny = len(edges_y)-1
+
+    if op == 0:
+        fill = np.inf
+    elif op == 1:
+        fill = -np.inf
+    else:
+        fill = 0.
+
+    tiles = np.full((nchunks, nx*ny), fill)
+    counts = np.zeros((nchunks, nx*ny), dtype=np.int64)
+    valid = np.zeros((nchunks, nx*ny), dtype=np.int64)
+
+    for _c in numba.prange(nchunks):
+        for _k in range((_c*n)//nchunks, ((_c+1)*n)//nchunks):
+            if not (edges_x[0] <= x[_k] <= edges_x[-1] and
+                    edges_y[0] <= y[_k] <= edges_y[-1]):
+                continue
+
+            ix = min(np.searchsorted(edges_x, x[_k], side='right')-1, nx-1)
+            iy = min(np.searchsorted(edges_y, y[_k], side='right')-1, ny-1)
+            _i = ix*ny + iy
+
+            counts[_c, _i] += 1
+            if np.isnan(values[_k]):
+                continue
+            valid[_c, _i] += 1
+
+            if op == 0:
+                tiles[_c, _i] = min(tiles[_c, _i], values[_k])
+            elif op == 1:
+                tiles[_c, _i] = max(tiles[_c, _i], values[_k])
+            else:
+                tiles[_c, _i] += values[_k]
+
+    # combine tiles
+    binned = tiles[0]
+    for _c in range(1, nchunks):
+        for _i in range(nx*ny):
+            if op == 0:
+                binned[_i] = min(binned[_i], tiles[_c, _i])
+            elif op == 1:
+                binned[_i] = max(binned[_i], tiles[_c, _i])
+            else:
+                binned[_i] += tiles[_c, _i]
+            counts[0, _i] += counts[_c, _i]
+            valid[0, _i] += valid[_c, _i]
+
+    for _i in range(nx*ny):
+        if valid[0, _i] == 0 and not (op == 2 and counts[0, _i] > 0):
+            # empty cell, or only NaN values
+            binned[_i] = np.nan
+        elif op == 3:
+            binned[_i] /= valid[0, _i]
+
+    return binned, counts[0]
+
+
+if numba is not None:
+    _bin2d_numba = numba.njit(parallel=True, cache=True)(_bin2d_kernel)
+
+
+def _reduce(da, dims, handle):
+    """ Reduces DataArray over the given dimensions
+
+    Applies `handle` (a NumPy-style reduction such as ``np.nanmin``, taking
+    an ``axis`` argument) directly to the underlying values, bypassing
+    xarray's reduction machinery
+
+    Dask-backed arrays, such as those returned by ``open_ds(..., chunks=...)``,
+    are reduced block by block, so that only the reduced array is held in
+    memory
+    """
+    axes = tuple(da.get_axis_num(dims))
+    kept = [dim for dim in da.dims if dim not in dims]
+
+    reduced = handle(da.data, axis=axes)
+    if _is_dask(reduced):
+        reduced = reduced.compute()
+
+    return type(da)(
+        data=reduced,
+        dims=kept,
+        coords={dim: da.coords[dim].values for dim in kept},
+        name=da.name,
+        attrs=da.attrs)
+
+
+def _max_likelihoods(da, var, dims):
+    """ Maximizes likelihood over the given dimensions
+
+    Returns unnormalized likelihoods. Because exp is monotonic, the maximum
+    likelihood follows from the minimum misfit, so exp only needs to be
+    evaluated over the reduced array
+    """
+    misfit = _reduce(da, dims, np.nanmin)
+    return misfit.copy(data=np.exp(
+        -(misfit.values - np.nanmin(misfit.values))/(2.*var)))
+
+
+def _marginal_likelihoods(da, var, dims):
+    """ Marginalizes likelihood over the given dimensions
+
+    Returns unnormalized likelihoods. Sums are carried out in log space,
+    which avoids underflow, and skip NaN misfit values, such as those from
+    empty stations. Unlike in `_max_likelihoods`, exp is still evaluated over
+    the full input array
+    """
+    marginals = _reduce(da, dims,
+        lambda values, axis: _logsumexp(-values/(2.*var), axis=axis))
+    return marginals.copy(data=np.exp(
+        marginals.values - np.nanmax(marginals.values)))
+
+
+def _logsumexp(values, axis):
+    # log(sum(exp(values))) over finite values only, evaluated lazily for
+    # Dask arrays, since scipy's logsumexp would first load the whole array
+    # into memory and would propagate NaN values
+    xp = dask.array if _is_dask(values) else np
+
+    finite = xp.isfinite(values)
+    maxvals = xp.where(finite, values, -np.inf).max(axis=axis, keepdims=True)
+    maxvals = xp.where(xp.isfinite(maxvals), maxvals, 0.)
+
+    sums = xp.where(finite, xp.exp(values - maxvals), 0.).sum(axis=axis)
+
+    # sums are at least one, unless all values are masked
+    return xp.where(sums > 0., xp.log(xp.maximum(sums, 1.)), -np.inf)\
+        + maxvals.squeeze(axis=axis)
+
+
+def _is_dask(values):
+    return dask is not None and isinstance(values, dask.array.Array)
+
+
 
 def likelihood_analysis(*args):
     """ Converts misfit to likelihood and multiplies together contributions 
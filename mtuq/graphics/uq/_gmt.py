@@ -62,14 +62,16 @@ def _plot_latlon_gmt(filename, lon, lat, values, best_latlon=None, lune_array=No
 
     data = np.column_stack((lon, lat, values))
 
+    # plot_latlon parses its input with awk, so values must be written as text
     _call(fullpath('mtuq/graphics/uq/_gmt/plot_latlon'),
         filename, data, supplemental_data=_parse_lune_array2(lon, lat, lune_array),
-        marker_coords=best_latlon, **kwargs)
+        marker_coords=best_latlon, binary=False, **kwargs)
 
 
 def _call(shell_script, filename, data, supplemental_data=None,
     title='', colormap='viridis', flip_cpt=False, colorbar_type=1,
-    colorbar_label='', colorbar_limits=None, marker_coords=None, marker_type=0):
+    colorbar_label='', colorbar_limits=None, marker_coords=None, marker_type=0,
+    binary=True):
 
     #
     # Common wrapper for all GMT plotting functions involving 2D surfaces
@@ -95,12 +97,16 @@ def _call(shell_script, filename, data, supplemental_data=None,
     except:
         minval, maxval, exp = _parse_limits(data[:,-1])
 
-    data[:,-1] /= 10.**exp
     cpt_step=(maxval-minval)/20.
 
-    # write values to be plotted as ASCII table
-    ascii_file_1 = _safename('tmp_'+filename+'_ascii1.txt')
-    _savetxt(ascii_file_1, data)
+    # write values to be plotted as binary or ASCII table (values are
+    # rescaled while being written, leaving the input array untouched)
+    if binary:
+        data_file = _safename('tmp_'+filename+'_data1.bin')
+        _savebin(data_file, data[:,:-1], data[:,-1]/10.**exp)
+    else:
+        data_file = _safename('tmp_'+filename+'_ascii1.txt')
+        _savetxt(data_file, data[:,:-1], data[:,-1]/10.**exp)
 
     # write supplementatal ASCII table, if given
     ascii_file_2 = _safename('tmp_'+filename+'_ascii2.txt')
@@ -118,7 +124,7 @@ def _call(shell_script, filename, data, supplemental_data=None,
            (shell_script,
             filename,
             filetype,
-            ascii_file_1,
+            data_file,
             ascii_file_2,
             minval,
             maxval,
@@ -203,12 +209,16 @@ def _plot_depth_gmt(filename, depths, values,
 
 def _parse_data(lon, lat, values):
 
-    lon, lat = np.meshgrid(lon, lat)
-    lat = lat.flatten()
-    lon = lon.flatten()
-    values = values.flatten()
+    # fills (lon, lat, value) table by broadcasting, without first forming
+    # meshgrid and flattened copies
+    lon, lat = np.asarray(lon), np.asarray(lat)
 
-    return np.column_stack((lon, lat, values))
+    data = np.empty((len(lat), len(lon), 3))
+    data[:,:,0] = lon[np.newaxis,:]
+    data[:,:,1] = lat[:,np.newaxis]
+    data[:,:,2] = np.reshape(values, (len(lat), len(lon)))
+
+    return data.reshape(-1, 3)
 
 
 def _parse_title(title):
@@ -302,6 +312,10 @@ def _parse_lune_array(lune_array):
     N = lune_array.shape[0]
     gmt_array = np.empty((N, 12))
 
+    # lune coordinates of all moment tensors at once
+    gmt_array[:, 0] = to_gamma(lune_array[:,1])
+    gmt_array[:, 1] = to_delta(lune_array[:,2])
+
     for _i in range(N):
         rho,v,w,kappa,sigma,h = lune_array[_i,:]
 
@@ -319,8 +333,6 @@ def _parse_lune_array(lune_array):
         scaled_mt = mt/10**(exponent)
         dummy_value = 0.
 
-        gmt_array[_i, 0] = to_gamma(v)
-        gmt_array[_i, 1] = to_delta(w)
         gmt_array[_i, 2] = dummy_value
         gmt_array[_i, 3:9] = scaled_mt
         gmt_array[_i, 9] = exponent+7
@@ -399,6 +411,11 @@ def _savetxt(filename, *args, fmt='%.6e'):
     np.savetxt(filename, np.column_stack(args), fmt=fmt)
 
 
+def _savebin(filename, *args):
+    # raw double-precision values, read by GMT with -bi<ncol>d
+    np.column_stack(args).astype(np.float64).tofile(filename)
+
+
 def _exponent(values):
     return np.floor(np.log10(np.max(np.abs(values))))
 
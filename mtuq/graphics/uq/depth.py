@@ -43,7 +43,6 @@ def plot_misfit_depth(filename, ds, origins, **kwargs):
 
 
     _check(ds)
-    ds = ds.copy()
 
     if issubclass(type(ds), DataArray):
         da = _misfit_regular(ds)
@@ -84,7 +83,6 @@ def plot_likelihood_depth(filename, ds, origins, var=None, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
 
     if issubclass(type(ds), DataArray):
         da = _likelihoods_regular(ds, var)
@@ -204,8 +202,7 @@ def _misfit_regular(da):
 
 
 def _likelihoods_regular(da, var):
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
+    likelihoods = da.copy(data=np.exp(-da.values/(2.*var)))
     likelihoods.values /= likelihoods.values.sum()
 
     dims = ('rho', 'v', 'w', 'kappa', 'sigma', 'h')
@@ -8,6 +8,7 @@ from matplotlib import pyplot
 from pandas import DataFrame
 from xarray import DataArray
 from mtuq.graphics._gmt import read_cpt, _cpt_path
+from mtuq.graphics.uq import _max_likelihoods, _marginal_likelihoods, _reduce
 from mtuq.graphics.uq._matplotlib import _plot_dc_matplotlib
 from mtuq.grid_search import MTUQDataArray, MTUQDataFrame
 from mtuq.util import dataarray_idxmin, dataarray_idxmax, defaults, warn
@@ -253,7 +254,7 @@ def _plot_dc(filename, da, show_best=True, colormap='hot',
 def _misfit_dc_regular(da):
     """ For each moment tensor orientation, extract minimum misfit
     """
-    misfit = da.min(dim=('origin_idx', 'rho', 'v', 'w'))
+    misfit = _reduce(da, ('origin_idx', 'rho', 'v', 'w'), np.nanmin)
 
     return misfit.assign_attrs({
         'best_mt': _min_mt(da),
@@ -264,11 +265,7 @@ def _misfit_dc_regular(da):
 def _likelihoods_dc_regular(da, var):
     """ For each moment tensor orientation, calculate maximum likelihood
     """
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
-    likelihoods.values /= likelihoods.values.sum()
-
-    likelihoods = likelihoods.max(dim=('origin_idx', 'rho', 'v', 'w'))
+    likelihoods = _max_likelihoods(da, var, ('origin_idx', 'rho', 'v', 'w'))
     likelihoods.values /= likelihoods.values.sum()
     #likelihoods /= dc_area
 
@@ -282,11 +279,7 @@ def _likelihoods_dc_regular(da, var):
 def _marginals_dc_regular(da, var):
     """ For each moment tensor orientation, calculate marginal likelihood
     """
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
-    likelihoods.values /= likelihoods.values.sum()
-
-    marginals = likelihoods.sum(dim=('origin_idx', 'rho', 'v', 'w'))
+    marginals = _marginal_likelihoods(da, var, ('origin_idx', 'rho', 'v', 'w'))
     marginals.values /= marginals.values.sum()
 
     return marginals.assign_attrs({
@@ -297,10 +290,9 @@ def _marginals_dc_regular(da, var):
 def _variance_reduction_dc_regular(da, data_norm):
     """ For each moment tensor orientation, extracts maximum variance reduction
     """
-    variance_reduction = 1. - da.copy()/data_norm
-
-    variance_reduction = variance_reduction.max(
-        dim=('origin_idx', 'rho', 'v', 'w'))
+    # maximum variance reduction corresponds to minimum misfit
+    variance_reduction = 1. - _reduce(
+        da, ('origin_idx', 'rho', 'v', 'w'), np.nanmin)/data_norm
 
     # widely-used convention - variance reducation as a percentage
     variance_reduction.values *= 100.
@@ -7,6 +7,8 @@ import numpy as np
 
 from matplotlib import pyplot
 
+from mtuq.graphics.uq import _as_regular, _bin2d, _max_likelihoods,\
+    _marginal_likelihoods, _reduce
 from mtuq.graphics.uq._gmt import _plot_force_gmt
 from mtuq.grid_search import DataFrame, DataArray, MTUQDataArray, MTUQDataFrame
 from mtuq.util import defaults, warn
@@ -38,7 +40,7 @@ def plot_misfit_force(filename, ds, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         misfit = _misfit_regular(ds)
@@ -78,7 +80,7 @@ def plot_likelihood_force(filename, ds, var, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         likelihoods = _likelihoods_regular(ds, var)
@@ -116,7 +118,7 @@ def plot_marginal_force(filename, ds, var, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         marginals = _marginals_regular(ds, var)
@@ -152,7 +154,7 @@ def plot_magnitude_tradeoffs_force(filename, ds, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         marginals = _magnitudes_regular(ds)
@@ -210,7 +212,7 @@ def _plot_force(filename, da, show_best=True, show_tradeoffs=False,
 def _misfit_regular(da):
     """ For each force orientation, extracts minimum misfit
     """
-    misfit = da.min(dim=('origin_idx', 'F0'))
+    misfit = _reduce(da, ('origin_idx', 'F0'), np.nanmin)
 
     return misfit.assign_attrs({
         'best_force': _min_force(da)
@@ -220,11 +222,7 @@ def _misfit_regular(da):
 def _likelihoods_regular(da, var):
     """ For each force orientation, calculates maximum likelihood value
     """
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
-    likelihoods.values /= likelihoods.values.sum()
-
-    likelihoods = likelihoods.max(dim=('origin_idx', 'F0'))
+    likelihoods = _max_likelihoods(da, var, ('origin_idx', 'F0'))
     likelihoods.values /= 4.*np.pi*likelihoods.values.sum()
 
     return likelihoods.assign_attrs({
@@ -236,11 +234,7 @@ def _marginals_regular(da, var):
     """ For each force orientation, calculates marginal likelihood value
     """
 
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
-    likelihoods.values /= likelihoods.values.sum()
-
-    marginals = likelihoods.sum(dim=('origin_idx', 'F0'))
+    marginals = _marginal_likelihoods(da, var, ('origin_idx', 'F0'))
     marginals.values /= 4.*np.pi*marginals.values.sum()
 
     return marginals.assign_attrs({
@@ -257,7 +251,7 @@ def _magnitudes_regular(da):
     nphi = len(phi)
     nh = len(h)
 
-    misfit = da.min(dim=('origin_idx'))
+    misfit = _reduce(da, ('origin_idx',), np.nanmin)
     magnitudes = np.empty((nphi,nh))
 
     for ip in range(nphi):
@@ -301,9 +295,8 @@ def _max_force(da):
 #
 
 def _misfit_random(df, **kwargs):
-    df = df.copy()
     df = df.reset_index()
-    da = _bin(df, lambda df: df.min(), **kwargs)
+    da = _bin(df, 'min', **kwargs)
 
     return da.assign_attrs({
         'best_force': _min_force(da)
@@ -311,11 +304,10 @@ def _misfit_random(df, **kwargs):
 
 
 def _likelihoods_random(df, var, **kwargs):
-    df = df.copy()
     df = np.exp(-df/(2.*var))
     df = df.reset_index()
 
-    da = _bin(df, lambda df: df.max(), **kwargs)
+    da = _bin(df, 'max', **kwargs)
     da.values /= 4.*np.pi*da.values.sum()
 
     return da.assign_attrs({
@@ -324,11 +316,10 @@ def _likelihoods_random(df, var, **kwargs):
 
 
 def _marginals_random(df, var, **kwargs):
-    df = df.copy()
     df = np.exp(-df/(2.*var))
     df = df.reset_index()
 
-    da = _bin(df, lambda df: df.sum()/len(df))
+    da = _bin(df, 'mean')
     da.values /= 4.*np.pi*da.values.sum()
 
     return da.assign_attrs({
@@ -351,26 +342,12 @@ def _bin(df, handle, npts_phi=60, npts_h=30):
     phi = closed_interval(0., 360, npts_phi+1)
     h = closed_interval(-1., +1., npts_h+1)
 
-    binned = np.empty((npts_h, npts_phi))
-    for _i in range(npts_h):
-        for _j in range(npts_phi):
-            # which grid points lie within cell (i,j)?
-            subset = df.loc[
-                df['phi'].between(phi[_j], phi[_j+1]) &
-                df['h'].between(h[_i], h[_i+1])]
-
-            if len(subset)==0:
-                print("Encountered empty bin\n"
-                      "phi: %f, %f\n"
-                      "h: %f, %f\n" %
-                      (phi[_j], phi[_j+1], h[_i], h[_i+1]) )
-
-            binned[_i, _j] = handle(subset[0])
+    binned = _bin2d(df['phi'], df['h'], df[0], phi, h, handle)
 
     return DataArray(
         dims=('phi', 'h'),
         coords=(centers_phi, centers_h),
-        data=binned.transpose()
+        data=binned
         )
 
 
@@ -38,7 +38,6 @@ def plot_misfit_latlon(filename, ds, origins, **kwargs):
     """
 
     _check(ds)
-    ds = ds.copy()
 
     if issubclass(type(ds), DataArray):
         da = _misfit_regular(ds)
@@ -74,7 +73,6 @@ def plot_likelihood_latlon(filename, ds, origins, **kwargs):
     """
 
     _check(ds)
-    ds = ds.copy()
 
     if issubclass(type(ds), DataArray):
         da = _likelihood_regular(ds)
@@ -15,6 +15,7 @@ import xarray
 
 from matplotlib import pyplot
 from mtuq.grid_search import DataArray, DataFrame, MTUQDataArray, MTUQDataFrame
+from mtuq.graphics.uq import _as_regular
 from mtuq.graphics.uq._gmt import _plot_lune_gmt
 from mtuq.util import defaults, warn
 from mtuq.util.math import lune_det, to_gamma, to_delta
@@ -51,7 +52,7 @@ def plot_misfit_lune(filename, ds, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         misfit = _misfit_vw_regular(ds)
@@ -88,7 +89,7 @@ def plot_likelihood_lune(filename, ds, var, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         likelihoods = _likelihoods_vw_regular(ds, var)
@@ -125,7 +126,7 @@ def plot_marginal_lune(filename, ds, var, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         marginals = _marginals_vw_regular(ds, var)
@@ -161,7 +162,7 @@ def plot_variance_reduction_lune(filename, ds, data_norm, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         variance_reduction = _variance_reduction_vw_regular(ds, data_norm)
@@ -197,7 +198,7 @@ def plot_magnitude_tradeoffs_lune(filename, ds, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         marginals = _magnitudes_vw_regular(ds)
@@ -122,7 +122,7 @@ ISO = MomentTensor([1.,1.,1.,0.,0.,0.])
 def _calculate_pdf(df, var, m0=None, nbins=50, normalized=False):
     """ Calculates marginal probability density function over angular distance
     """
-    likelihoods = np.exp(-df.copy()/(2.*var))
+    likelihoods = np.exp(-df/(2.*var))
 
     return _map_omega(likelihoods, lambda pts: sum(pts), m0=m0, nbins=nbins,
         normalized=normalized)
@@ -131,7 +131,7 @@ def _calculate_pdf(df, var, m0=None, nbins=50, normalized=False):
 def _screening_curve_random(df, var, nbins=50):
     """ Calculates explosion screening curve from randomly-drawn samples
     """
-    likelihoods = np.exp(-df.copy()/(2.*var))
+    likelihoods = np.exp(-df/(2.*var))
 
     return _map_omega(likelihoods, lambda pts: pts.max(), m0=ISO, nbins=nbins,
         normalized=False)
@@ -240,14 +240,12 @@ def _bin_omega(omega, values, nbins=50, mask_empty=True):
 
 def _argmax(df):
 
-    df = df.copy()
     df = df.reset_index()
     return df[0].idxmax()
 
 
 def _to_array(df):
 
-    df = df.copy()
     df = df.reset_index()
 
     try:
@@ -270,7 +268,6 @@ def _type(ds):
         dims = ds.dims
     except:
         # DataFrame
-        ds = ds.copy()
         ds = ds.reset_index()
         dims = list(ds.columns.values)
 
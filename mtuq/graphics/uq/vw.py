@@ -9,6 +9,8 @@ import xarray
 
 from mtuq.grid.moment_tensor import _semiregular
 from mtuq.grid_search import DataArray, DataFrame, MTUQDataArray, MTUQDataFrame
+from mtuq.graphics.uq import _as_regular, _bin2d, _max_likelihoods,\
+    _marginal_likelihoods, _reduce
 from mtuq.graphics.uq._gmt import _plot_vw_gmt
 from mtuq.graphics.uq._matplotlib import _plot_vw_matplotlib
 from mtuq.util import dataarray_idxmin, dataarray_idxmax, defaults, product
@@ -53,7 +55,7 @@ def plot_misfit_vw(filename, ds, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         misfit = _misfit_vw_regular(ds)
@@ -90,7 +92,7 @@ def plot_likelihood_vw(filename, ds, var, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         likelihoods = _likelihoods_vw_regular(ds, var)
@@ -128,7 +130,7 @@ def plot_marginal_vw(filename, ds, var, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         marginals = _marginals_vw_regular(ds, var)
@@ -166,7 +168,7 @@ def plot_variance_reduction_vw(filename, ds, data_norm, **kwargs):
         })
 
     _check(ds)
-    ds = ds.copy()
+    ds = _as_regular(ds)
 
     if issubclass(type(ds), DataArray):
         variance_reduction = _variance_reduction_vw_regular(ds, data_norm)
@@ -234,7 +236,7 @@ def _plot_vw(filename, da, show_best=True, show_tradeoffs=False,
 def _misfit_vw_regular(da):
     """ For each source type, extracts minimum misfit
     """
-    misfit = da.min(dim=('origin_idx', 'rho', 'kappa', 'sigma', 'h'))
+    misfit = _reduce(da, ('origin_idx', 'rho', 'kappa', 'sigma', 'h'), np.nanmin)
 
     return misfit.assign_attrs({
         'best_mt': _min_mt(da),
@@ -246,11 +248,7 @@ def _misfit_vw_regular(da):
 def _likelihoods_vw_regular(da, var):
     """ For each source type, calculates maximum likelihood value
     """
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
-    likelihoods.values /= likelihoods.values.sum()
-
-    likelihoods = likelihoods.max(dim=('origin_idx', 'rho', 'kappa', 'sigma', 'h'))
+    likelihoods = _max_likelihoods(da, var, ('origin_idx', 'rho', 'kappa', 'sigma', 'h'))
     likelihoods.values /= likelihoods.values.sum()
     likelihoods /= vw_area
 
@@ -266,11 +264,7 @@ def _marginals_vw_regular(da, var):
     """ For each source type, calculates marginal likelihood value
     """
 
-    likelihoods = da.copy()
-    likelihoods.values = np.exp(-likelihoods.values/(2.*var))
-    likelihoods.values /= likelihoods.values.sum()
-
-    marginals = likelihoods.sum(dim=('origin_idx', 'rho', 'kappa', 'sigma', 'h'))
+    marginals = _marginal_likelihoods(da, var, ('origin_idx', 'rho', 'kappa', 'sigma', 'h'))
     marginals.values /= marginals.values.sum()
     marginals /= vw_area
 
@@ -289,7 +283,7 @@ def _magnitudes_vw_regular(da):
     nv = len(v)
     nw = len(w)
 
-    misfit = da.min(dim=('origin_idx', 'kappa', 'sigma', 'h'))
+    misfit = _reduce(da, ('origin_idx', 'kappa', 'sigma', 'h'), np.nanmin)
     magnitudes = np.empty((nv,nw))
 
     for iv in range(nv):
@@ -314,10 +308,9 @@ def _magnitudes_vw_regular(da):
 def _variance_reduction_vw_regular(da, data_norm):
     """ For each source type, extracts maximum variance reduction
     """
-    variance_reduction = 1. - da.copy()/data_norm
-
-    variance_reduction = variance_reduction.max(
-        dim=('origin_idx', 'rho', 'kappa', 'sigma', 'h'))
+    # maximum variance reduction corresponds to minimum misfit
+    variance_reduction = 1. - _reduce(
+        da, ('origin_idx', 'rho', 'kappa', 'sigma', 'h'), np.nanmin)/data_norm
 
     # widely-used convention - variance reducation as a percentage
     variance_reduction.values *= 100.
@@ -417,9 +410,8 @@ def _product_vw(*arrays, best_vw='max'):
 #
 
 def _misfit_vw_random(df, **kwargs):
-    df = df.copy()
     df = df.reset_index()
-    da = _bin_vw_semiregular(df, lambda df: df.min(), **kwargs)
+    da = _bin_vw_semiregular(df, 'min', **kwargs)
 
     return da.assign_attrs({
         'best_vw':  _min_vw(da),
@@ -427,11 +419,10 @@ def _misfit_vw_random(df, **kwargs):
 
 
 def _likelihoods_vw_random(df, var, **kwargs):
-    df = df.copy()
     df = np.exp(-df/(2.*var))
     df = df.reset_index()
 
-    da = _bin_vw_semiregular(df, lambda df: df.max(), **kwargs)
+    da = _bin_vw_semiregular(df, 'max', **kwargs)
     da.values /= da.values.sum()
     da.values /= vw_area
 
@@ -441,11 +432,10 @@ def _likelihoods_vw_random(df, var, **kwargs):
 
 
 def _marginals_vw_random(df, var, **kwargs):
-    df = df.copy()
     df = np.exp(-df/(2.*var))
     df = df.reset_index()
 
-    da = _bin_vw_semiregular(df, lambda df: df.sum()/len(df))
+    da = _bin_vw_semiregular(df, 'mean')
     da.values /= da.values.sum()
     da.values /= vw_area
 
@@ -455,10 +445,9 @@ def _marginals_vw_random(df, var, **kwargs):
 def _variance_reduction_vw_random(df, data_norm, **kwargs):
     """ For each source type, extracts minimum misfit
     """
-    df = df.copy()
     df = 1 - df/data_norm
     df = df.reset_index()
-    da = _bin_vw_semiregular(df, lambda df: df.max(), **kwargs)
+    da = _bin_vw_semiregular(df, 'max', **kwargs)
 
     return da.assign_attrs({
         'best_vw':  _max_vw(da),
@@ -480,20 +469,12 @@ def _bin_vw_regular(df, handle, npts_v=20, npts_w=40):
     v = closed_interval(-1./3., 1./3., npts_v+1)
     w = closed_interval(-3./8.*np.pi, 3./8.*np.pi, npts_w+1)
 
-    binned = np.empty((npts_w, npts_v))
-    for _i in range(npts_w):
-        for _j in range(npts_v):
-            # which grid points lie within cell (i,j)?
-            subset = df.loc[
-                df['v'].between(v[_j], v[_j+1]) &
-                df['w'].between(w[_i], w[_i+1])]
-
-            binned[_i, _j] = handle(subset[0])
+    binned = _bin2d(df['v'], df['w'], df[0], v, w, handle)
 
     return DataArray(
         dims=('v', 'w'),
         coords=(centers_v, centers_w),
-        data=binned.transpose()
+        data=binned
         )
 
 
@@ -523,29 +504,16 @@ def _bin_vw_semiregular(df, handle, npts_v=20, npts_w=40, tightness=0.6, normali
 
 
     # bin grid points into cells
-    binned = np.empty((npts_w, npts_v))
-    binned[:] = np.nan
-    for _i in range(npts_w):
-        for _j in range(npts_v):
-            # which grid points lie within cell (i,j)?
-            subset = df.loc[
-                df['v'].between(edges_v[_j], edges_v[_j+1]) &
-                df['w'].between(edges_w[_i], edges_w[_i+1])]
-
-            if len(subset)==0:
-                print("Encountered empty bin")
-
-            binned[_i, _j] = handle(subset[0])
+    binned = _bin2d(df['v'], df['w'], df[0], edges_v, edges_w, handle)
 
-            if normalize:
-              # normalize by area of cell
-              binned[_i, _j] /= edges_v[_j+1] - edges_v[_j]
-              binned[_i, _j] /= edges_w[_i+1] - edges_w[_i]
+    if normalize:
+        # normalize by area of cell
+        binned /= np.outer(np.diff(edges_v), np.diff(edges_w))
 
     return DataArray(
         dims=('v', 'w'),
         coords=(centers_v, centers_w),
-        data=binned.transpose()
+        data=binned
         )
 
 
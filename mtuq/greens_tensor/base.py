@@ -7,6 +7,7 @@ from mtuq.event import Origin
 from mtuq.station import Station
 from mtuq.dataset import Dataset
 from mtuq.util.signal import check_time_sampling
+from mtuq.wavelet import Wavelet
 from obspy.core import Stream, Trace
 from obspy.geodetics import gps2dist_azimuth
 from scipy.signal import fftconvolve
@@ -193,12 +194,9 @@ class GreensTensor(Stream):
             synthetics = self._allocate_stream()
 
         for _i, component in enumerate(self.components):
-            # Even with careful attention to index order, np.dot is very slow.
-            # For some reason the following is faster
-            data = synthetics[_i].data
-            data[:] = 0.
-            for _j in range(len(source)):
-                data += source[_j]*array[_i, _j, :]
+            # writing the matrix-vector product directly into the trace
+            # avoids temporary arrays
+            np.dot(source, array[_i, :, :], out=synthetics[_i].data)
         return synthetics
 
 
@@ -428,8 +426,30 @@ class GreensTensorList(list):
         Source wavelet
 
         """
+        # rather than convolving one trace at a time, groups traces with
+        # the same time sampling and convolves each group in one batch,
+        # unless wavelet or tensor class customizes convolution, in which
+        # case the public per-trace methods are used instead
+        batched = isinstance(wavelet, Wavelet) and\
+            type(wavelet).convolve is Wavelet.convolve and\
+            type(wavelet)._convolve_array is Wavelet._convolve_array
+
+        groups = {}
         for tensor in self:
-            tensor.convolve(wavelet)
+            if not batched or type(tensor).convolve is not GreensTensor.convolve:
+                tensor.convolve(wavelet)
+                continue
+
+            for trace in tensor:
+                key = (trace.stats.npts, trace.stats.delta)
+                groups.setdefault(key, []).append(trace)
+
+        for (_, dt), traces in groups.items():
+            convolved = wavelet._convolve_array(
+                np.stack([trace.data for trace in traces]), dt)
+
+            for trace, data in zip(traces, convolved):
+                trace.data = data
 
 
     def tag_add(self, tag):
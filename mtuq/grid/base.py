@@ -95,10 +95,12 @@ class Grid(object):
     def to_array(self):
         """ Returns the entire set of grid points as a NumPy array
         """
-        array = np.zeros((self.size, self.ndim))
-        for _i in range(self.size):
-            array[_i, :] = self.get(_i+self.start, callback=None)
-        return array
+        # same ordering as `get`, in which the last axis varies fastest
+        indices = np.unravel_index(
+            np.arange(self.start, self.stop), self.shape)
+
+        return np.column_stack([array[idx]
+            for array, idx in zip(self.coords, indices)])
 
 
     def to_dataarray(self, values=None):
@@ -132,7 +134,16 @@ class Grid(object):
             for _i in range(self.ndim)}
         data_vars.update({'values': values})
 
-        return DataFrame(data_vars)
+        # tag as regularly spaced, so that plotting functions can reshape
+        # rather than bin (tuples rather than arrays, since pandas copies and
+        # compares attrs, for example when concatenating)
+        df = DataFrame(data_vars)
+        df.attrs.update({
+            'regular': True,
+            'dims': tuple(self.dims),
+            'coords': tuple(tuple(map(float, array)) for array in self.coords),
+            })
+        return df
 
 
     def get(self, i, **kwargs):
@@ -295,10 +306,8 @@ class UnstructuredGrid(object):
     def to_array(self):
         """ Returns the entire set of grid points as a NumPy array
         """
-        array = np.zeros((self.size, self.ndim))
-        for _i in range(self.size):
-            array[_i, :] = self.get(_i+self.start, callback=None)
-        return array
+        return np.column_stack([array[:self.size]
+            for array in self.coords])
 
 
     def to_dataframe(self, values=None):
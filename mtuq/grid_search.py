@@ -2,13 +2,15 @@
 import h5py
 import netCDF4
 import numpy as np
+import os
 import pandas
 import xarray
 
 from collections.abc import Iterable
+from contextlib import contextmanager
 from mtuq.event import Origin
 from mtuq.grid import DataFrame, DataArray, Grid, UnstructuredGrid
-from mtuq.util import gather2, iterable, timer, remove_list, warn,\
+from mtuq.util import gather2, scatter2, iterable, timer, remove_list, warn,\
     ProgressCallback, dataarray_idxmin, dataarray_idxmax
 from os.path import splitext
 from xarray.core.formatting import unindexed_dims_repr
@@ -18,7 +20,8 @@ xarray.set_options(keep_attrs=True)
 
 
 def grid_search(data, greens, misfit, origins, sources, 
-    msg_interval=25, timed=True, verbose=1, gather=True):
+    msg_interval=25, timed=True, verbose=1, gather=True, chunk_size=None,
+    processes=None):
 
     """ Evaluates misfit over grids
 
@@ -69,6 +72,23 @@ def grid_search(data, greens, misfit, origins, sources,
     (ignored outside MPI environment)
 
 
+    ``chunk_size`` (`int`):
+    If given, process 0 hands out chunks of this many sources to the other
+    processes on demand, rather than dividing the grid evenly up front.
+    Keeps all processes busy when misfit evaluation cost varies from source
+    to source. Process 0 evaluates chunks itself whenever no other process
+    is waiting for work, so a process that becomes idle meanwhile may wait
+    up to one chunk evaluation for its next chunk; smaller chunks shorten
+    these waits at the cost of more messages. Implies `gather=True`
+    (ignored outside MPI environment)
+
+
+    ``processes`` (`int`):
+    If given, the source grid is divided among this many worker processes on
+    the local machine, providing parallelism without MPI
+    (ignored inside MPI environment)
+
+
     .. note:
 
       If invoked from an MPI environment, the grid is partitioned between
@@ -86,6 +106,7 @@ def grid_search(data, greens, misfit, origins, sources,
     if type(sources) not in (Grid, UnstructuredGrid):
         raise TypeError
 
+    nthreads = None
     if _is_mpi_env():
         from mpi4py import MPI
         comm = MPI.COMM_WORLD
@@ -94,6 +115,10 @@ def grid_search(data, greens, misfit, origins, sources,
         if nproc > sources.size:
             raise Exception('Number of CPU cores exceeds size of grid')
 
+        # multithreaded misfit kernels would otherwise oversubscribe cores
+        # shared by several processes on the same node
+        nthreads = (os.cpu_count() or 1)//_get_node_size(comm)
+
 
     # print debugging information
     if verbose>0 and _is_mpi_env() and iproc==0:
@@ -109,15 +134,38 @@ def grid_search(data, greens, misfit, origins, sources,
             (len(origins)*len(sources)))
 
 
+    if _is_mpi_env() and chunk_size and sources.size >= 4*nproc:
+        #
+        # hand out chunks of the grid to MPI processes on demand
+        #
+
+        with _num_threads(nthreads):
+            values = _grid_search_dynamic(
+                comm, data, greens, misfit, origins, sources, int(chunk_size),
+                timed=timed and iproc==0)
+
+        if iproc!=0:
+            return
+
+        if issubclass(type(sources), Grid):
+            return _to_dataarray(origins, sources, values)
+
+        elif issubclass(type(sources), UnstructuredGrid):
+            return _to_dataframe(origins, sources, values)
+
+
     if _is_mpi_env():
         #
         # divide up the grid search over MPI processes
         #
         _all = sources
-        _subsets = None
-        if iproc == 0:
-            _subsets = sources.partition(nproc)
-        sources = comm.scatter(_subsets, root=0)
+        if issubclass(type(sources), UnstructuredGrid):
+            sources = _scatter_unstructured(comm, sources)
+        else:
+            _subsets = None
+            if iproc == 0:
+                _subsets = sources.partition(nproc)
+            sources = comm.scatter(_subsets, root=0)
 
         if iproc != 0:
             timed = False
@@ -127,9 +175,16 @@ def grid_search(data, greens, misfit, origins, sources,
     #
     # evaluate misfit over grids
     #
-    values = _grid_search_serial(
-        data, greens, misfit, origins, sources, timed=timed,
-        msg_interval=msg_interval)
+    if processes and processes > 1 and not _is_mpi_env():
+        values = _grid_search_pool(
+            data, greens, misfit, origins, sources,
+            min(int(processes), sources.size), timed=timed)
+
+    else:
+        with _num_threads(nthreads):
+            values = _grid_search_serial(
+                data, greens, misfit, origins, sources, timed=timed,
+                msg_interval=msg_interval)
 
 
     #
@@ -175,6 +230,180 @@ def _grid_search_serial(data, greens, misfit, origins, sources,
     return np.concatenate(values, axis=1)
 
 
+@timer
+def _grid_search_pool(data, greens, misfit, origins, sources, processes,
+    timed=True):
+    """ Evaluates misfit over origin and source grids
+    (multiprocessing implementation)
+
+    The source grid is partitioned among worker processes. Data, Green's
+    functions and misfit function are handed to each worker once, when it
+    starts, rather than with every partition
+
+    As with any use of `multiprocessing`, the calling script must guard its
+    main code with ``if __name__=='__main__'``
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    # workers are started fresh rather than forked, since forking a process
+    # that already uses multithreaded libraries is unsafe
+    with ProcessPoolExecutor(max_workers=processes,
+        mp_context=get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(data, greens, misfit, origins)) as executor:
+
+        values = list(executor.map(
+            _grid_search_worker, sources.partition(processes)))
+
+    # returns NumPy array of shape `(len(sources), len(origins))`
+    return np.concatenate(values, axis=0)
+
+
+_worker_args = None
+
+
+def _init_worker(*args):
+    global _worker_args
+    _worker_args = args
+
+    # multithreaded misfit kernels would otherwise oversubscribe cores
+    _set_num_threads(1)
+
+
+def _set_num_threads(nthreads):
+    # limits the number of threads used by Numba-compiled kernels
+    try:
+        import numba
+    except ImportError:
+        return
+
+    numba.set_num_threads(
+        max(1, min(nthreads, numba.config.NUMBA_NUM_THREADS)))
+
+
+@contextmanager
+def _num_threads(nthreads):
+    # limits the number of threads used by Numba-compiled kernels, restoring
+    # the previous limit afterwards (no limit if `nthreads` is None)
+    try:
+        import numba
+    except ImportError:
+        numba = None
+
+    if numba is None or nthreads is None:
+        yield
+        return
+
+    previous = numba.get_num_threads()
+    _set_num_threads(nthreads)
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous)
+
+
+def _grid_search_worker(sources):
+    data, greens, misfit, origins = _worker_args
+    return _grid_search_serial(
+        data, greens, misfit, origins, sources, timed=False, msg_interval=0)
+
+
+@timer
+def _grid_search_dynamic(comm, data, greens, misfit, origins, sources,
+    chunk_size, timed=True):
+    """ Evaluates misfit over origin and source grids
+    (MPI implementation with dynamic load balancing)
+
+    Process 0 hands out chunks of the source grid to the other processes
+    as soon as they become idle, and collects the results directly into a
+    preallocated array.  In between, process 0 evaluates chunks itself.
+    Process 0 returns an array of shape `(len(sources), len(origins))`;
+    other processes return `None`
+
+    Randomly-drawn grids differ from process to process, so only the grid
+    from process 0 is used.  Of this grid, only dimensions, callback and,
+    for regular grids, axes are broadcast; coordinates of unstructured grids
+    are sent along with each chunk
+    """
+    from mpi4py import MPI
+
+    if comm.rank == 0:
+        header = (sources.dims, sources.callback,
+            sources.coords if issubclass(type(sources), Grid) else None)
+    else:
+        header = None
+
+    dims, callback, axes = comm.bcast(header, root=0)
+
+    def _evaluate(chunk):
+        start, stop, coords = chunk
+
+        if axes is not None:
+            chunk_sources = Grid(dims, axes, start, stop, callback=callback)
+        else:
+            chunk_sources = UnstructuredGrid(dims, coords, start, stop,
+                callback=callback)
+
+        return _grid_search_serial(data, greens, misfit, origins,
+            chunk_sources, timed=False, msg_interval=0)
+
+    if comm.rank == 0:
+        ni = len(origins)
+        nj = len(sources)
+
+        chunks = []
+        for start in range(0, nj, chunk_size):
+            stop = min(start+chunk_size, nj)
+            coords = None
+            if axes is None:
+                coords = [array[start:stop] for array in sources.coords]
+            chunks += [(start, stop, coords)]
+
+        values = np.empty((nj, ni))
+        status = MPI.Status()
+
+        ichunk = 0
+        nactive = comm.size-1
+        while nactive > 0:
+            if ichunk < len(chunks) and not comm.Iprobe(
+                source=MPI.ANY_SOURCE, tag=_TAG_READY):
+                # no process is waiting for work, so evaluate next chunk here
+                start, stop, _ = chunks[ichunk]
+                values[start:stop, :] = _evaluate(chunks[ichunk])
+                ichunk += 1
+                continue
+
+            # idle process reports back, possibly with results
+            result = comm.recv(source=MPI.ANY_SOURCE, tag=_TAG_READY,
+                status=status)
+
+            if result is not None:
+                (start, stop), chunk_values = result
+                values[start:stop, :] = chunk_values
+
+            if ichunk < len(chunks):
+                comm.send(chunks[ichunk], dest=status.Get_source(),
+                    tag=_TAG_WORK)
+                ichunk += 1
+            else:
+                comm.send(None, dest=status.Get_source(), tag=_TAG_WORK)
+                nactive -= 1
+
+        return values
+
+    else:
+        result = None
+        while True:
+            comm.send(result, dest=0, tag=_TAG_READY)
+            chunk = comm.recv(source=0, tag=_TAG_WORK)
+
+            if chunk is None:
+                return
+
+            result = (chunk[:2], _evaluate(chunk))
+
+
 
 class MTUQDataArray(xarray.DataArray):
     """ Data structure for storing values on regularly-spaced grids
@@ -209,7 +438,11 @@ class MTUQDataArray(xarray.DataArray):
         """ Saves grid search results to NetCDF file
         """
         print('  saving NetCDF file: %s' % filename)
-        self.to_netcdf(filename)
+
+        # misfit values vary smoothly over the grid and compress well
+        ds = self.to_dataset(name=self.name or 'values')
+        ds.to_netcdf(filename,
+            encoding={name: {'zlib': True, 'complevel': 3} for name in ds})
 
     def __repr__(self):
         summary = [
@@ -263,7 +496,7 @@ class MTUQDataFrame(pandas.DataFrame):
         """
         print('  saving HDF5 file: %s' % filename)
         df = pandas.DataFrame(self.values, index=self.index)
-        df.to_hdf(filename, key='df', mode='w')
+        df.to_hdf(filename, key='df', mode='w', complevel=3, complib='zlib')
 
     @property
     def _constructor(self):
@@ -274,6 +507,52 @@ class MTUQDataFrame(pandas.DataFrame):
 # utility functions
 #
 
+# MPI message tags used by _grid_search_dynamic
+_TAG_READY = 1
+_TAG_WORK = 2
+
+
+def _scatter_unstructured(comm, sources):
+    """ Partitions `UnstructuredGrid` on process 0 among all processes
+
+    Equivalent to scattering the result of ``sources.partition``, except that
+    coordinates are sent as one contiguous array rather than pickled
+    """
+    if comm.rank == 0:
+        header = (sources.dims, sources.callback, sources.size)
+        array = sources.to_array()
+    else:
+        header = None
+        array = None
+
+    dims, callback, size = comm.bcast(header, root=0)
+    array = scatter2(comm, array, root=0)
+
+    start = int(comm.rank*size/comm.size)
+    stop = int((comm.rank+1)*size/comm.size)
+
+    return UnstructuredGrid(dims, list(array.T), start, stop,
+        callback=callback)
+
+
+def _get_node_size(comm):
+    """ Returns number of processes in `comm` on the local node
+
+    Splitting a communicator is collective and allocates a new communicator,
+    so this is done only once
+    """
+    global _node_size
+    if _node_size is None:
+        from mpi4py import MPI
+        node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED)
+        _node_size = node_comm.size
+        node_comm.Free()
+    return _node_size
+
+
+_node_size = None
+
+
 def _is_mpi_env():
     try:
         import mpi4py
@@ -346,7 +625,7 @@ def _to_dataframe(origins, sources, values, index_type=2):
 # I/O functions
 #
 
-def open_ds(filename, format=None):
+def open_ds(filename, format=None, chunks=None):
     """ Reads grid search results from disk
 
     .. rubric :: Parameters
@@ -357,6 +636,11 @@ def open_ds(filename, format=None):
     ``format`` (`str`):
     File format ('NetCDF' or 'HDF5')
 
+    ``chunks`` (`dict`):
+    If given, NetCDF results are opened as a Dask-backed array and read
+    from disk block by block as needed, rather than all at once
+    (requires `dask`)
+
     """
     if not format:
         # try to determine file format, if not given
@@ -373,17 +657,22 @@ def open_ds(filename, format=None):
         return _open_df(filename)
 
     elif format.upper() in ['NC', 'NC4', 'NETCDF', 'NETCDF4']:
-        return _open_da(filename)
+        return _open_da(filename, chunks=chunks)
 
     else:
         raise Exception('File format not supported: %s' % filename)
 
 
-def _open_da(filename):
+def _open_da(filename, chunks=None):
     """ Reads MTUQDataArray from NetCDF file
     """
-    da = xarray.open_dataarray(filename)
-    return MTUQDataArray(data=da.values, coords=da.coords, dims=da.dims)
+    if chunks is None:
+        with xarray.open_dataarray(filename) as da:
+            return MTUQDataArray(data=da.values, coords=da.coords, dims=da.dims)
+
+    # values remain on disk until needed
+    da = xarray.open_dataarray(filename, chunks=chunks)
+    return MTUQDataArray(data=da.data, coords=da.coords, dims=da.dims)
 
 
 def _open_df(filename):
@@ -1,5 +1,4 @@
 
-import obspy
 import numpy as np
 
 from os.path import basename, exists
@@ -7,6 +6,7 @@ from mtuq.greens_tensor.FK import GreensTensor
 from mtuq.io.clients.base import Client as ClientBase
 from mtuq.util.signal import resample
 from obspy.core import Stream
+from obspy.io.sac import SACTrace
 from obspy.geodetics import gps2dist_azimuth
 
 
@@ -129,9 +129,10 @@ class Client(ClientBase):
         if self.include_mt:
 
             for _i, ext in enumerate(EXTENSIONS):
-                trace = obspy.read('%s/%s_%s/%s.grn.%s' %
-                    (self.path, self.model, dep, dst, ext),
-                    format='sac')[0]
+                # reading through SACTrace skips the format detection and
+                # plugin dispatch that obspy.read performs for every file
+                trace = SACTrace.read('%s/%s_%s/%s.grn.%s' %
+                    (self.path, self.model, dep, dst, ext)).to_obspy_trace()
 
                 trace.stats.channel = CHANNELS[_i]
                 trace.stats._component = CHANNELS[_i][0]
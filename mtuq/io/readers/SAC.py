@@ -5,6 +5,7 @@ import numpy as np
 import obspy
 import warnings
 
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from os.path import join
 from obspy.core import Stream
@@ -32,13 +33,15 @@ def read(filenames, station_id_list=None, event_id=None, tags=[]):
     Tags to be supplied to the Dataset
 
     """
-    # read traces one at a time
+    # read traces concurrently, to overlap file system latency
+    filenames = _glob(filenames)
+
     data = Stream()
-    for filename in _glob(filenames):
-        try:
-            data += obspy.read(filename, format='sac')
-        except:
-            print('Not a SAC file: %s' % filename)
+    if filenames:
+        with ThreadPoolExecutor(max_workers=min(32, len(filenames))) as executor:
+            for stream in executor.map(_read_sac, filenames):
+                if stream is not None:
+                    data += stream
 
     assert len(data) > 0, Exception(
         "Failed to read in any SAC files.")
@@ -182,6 +185,13 @@ def _get_station(stream, origin, attach_sac_headers=True):
     return station
 
 
+def _read_sac(filename):
+    try:
+        return obspy.read(filename, format='sac')
+    except:
+        print('Not a SAC file: %s' % filename)
+
+
 def _glob(filenames):
    # glob any wildcards
    _list = list()
@@ -70,6 +70,12 @@ class WaveformMisfit(object):
     ``optimization_level`` (`int`): optimization level 
     (see further details below)
 
+    ``jit`` (`bool`): at optimization level 2, use a Numba-compiled
+    multithreaded kernel in place of the C extension, if Numba is installed
+
+    ``gpu`` (`bool`): at optimization level 2, evaluate misfit on a CUDA
+    device in place of the C extension, if CuPy is installed
+
 
     .. note:: 
 
@@ -107,6 +113,17 @@ class WaveformMisfit(object):
       discretization.
 
 
+    .. note::
+
+      At optimization level 2, cross-correlations between data and Green's
+      functions are cached for reuse by subsequent calls, such as when a grid
+      search is evaluated in chunks.  Cached values are looked up by the
+      identity of the `Dataset` and of the individual `GreensTensor` objects,
+      not by their contents.  If data or Green's functions are modified in
+      place between calls (for example, by reprocessing their traces), pass
+      copies instead, or else stale correlations will be used.
+
+
     .. note:: 
 
       During installation, C extension modules are automatically compiled by
@@ -122,6 +139,8 @@ class WaveformMisfit(object):
         time_shift_min=0.,
         time_shift_max=0.,
         optimization_level=2,
+        jit=False,
+        gpu=False,
         ):
         """ Function handle constructor
         """
@@ -151,11 +170,21 @@ class WaveformMisfit(object):
 
         assert optimization_level in [0,1,2]
 
+        if jit and level2.numba is None:
+            warn("Numba not found. Falling back to C extension")
+            jit = False
+
+        if gpu and level2.cupy is None:
+            warn("CuPy not found. Falling back to C extension")
+            gpu = False
+
         self.norm = norm
         self.time_shift_min = time_shift_min
         self.time_shift_max = time_shift_max
         self.time_shift_groups = time_shift_groups
         self.optimization_level = optimization_level
+        self.jit = jit
+        self.gpu = gpu
 
 
     def __call__(self, data, greens, sources, progress_handle=Null(), 
@@ -202,7 +231,8 @@ class WaveformMisfit(object):
         if optimization_level==2:
             return level2.misfit(
                 data, greens, sources, self.norm, self.time_shift_groups,
-                self.time_shift_min, self.time_shift_max, progress_handle)
+                self.time_shift_min, self.time_shift_max, progress_handle,
+                jit=self.jit, gpu=self.gpu)
 
 
     def collect_attributes(self, data, greens, source):
@@ -6,15 +6,28 @@ See ``mtuq/misfit/waveform/__init__.py`` for more information
 
 import numpy as np
 import time
+import weakref
+from collections import OrderedDict
 from copy import deepcopy
 from mtuq.misfit.waveform.level1 import correlate
 from mtuq.util.math import to_mij, to_rtp
 from mtuq.util.signal import get_components, get_time_sampling
 from mtuq.misfit.waveform import c_ext_L2
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
 
 def misfit(data, greens, sources, norm, time_shift_groups,
-    time_shift_min, time_shift_max, msg_handle, debug_level=0):
+    time_shift_min, time_shift_max, msg_handle, debug_level=0, jit=False,
+    gpu=False):
     """
     Data misfit function (fast Python/C version)
 
@@ -36,23 +49,16 @@ def misfit(data, greens, sources, norm, time_shift_groups,
 
 
     #
-    # collapse main structures into NumPy arrays
+    # cross-correlate data and synthetics
     #
-    data = _get_data(data, stations, components)
-    greens = _get_greens(greens, stations, components)
+    padding = _get_padding(time_shift_min, time_shift_max, dt)
+    data_data, greens_data, greens_greens = _get_correlations(
+        data, greens, stations, components, padding)
+
     sources = _to_array(sources)
 
     # sanity checks
-    _check(data, greens, sources)
-
-
-    #
-    # cross-correlate data and synthetics
-    #
-    padding = _get_padding(time_shift_min, time_shift_max, dt)
-    data_data = _autocorr_1(data)
-    greens_greens = _autocorr_2(greens, padding)
-    greens_data = _corr_1_2(data, greens, padding)
+    _check(data_data, greens_data, sources)
 
     if norm=='hybrid':
         hybrid_norm = 1
@@ -74,7 +80,17 @@ def misfit(data, greens, sources, norm, time_shift_groups,
 
     start_time = time.time()
 
-    if norm in ['L2', 'hybrid']:
+    if norm in ['L2', 'hybrid'] and gpu and cupy is not None:
+        results = _misfit_batched(
+           data_data, greens_data, greens_greens, sources, groups, weights,
+           hybrid_norm, dt, xp=cupy)
+
+    elif norm in ['L2', 'hybrid'] and jit and numba is not None:
+        results = _misfit_numba(
+           data_data, greens_data, greens_greens, sources, groups, weights,
+           hybrid_norm, dt, padding[0]+padding[1]+1)
+
+    elif norm in ['L2', 'hybrid']:
         results = c_ext_L2.misfit(
            data_data, greens_data, greens_greens, sources, groups, weights,
            hybrid_norm, dt, padding[0], padding[1], debug_level, *msg_args)
@@ -89,6 +105,124 @@ def misfit(data, greens, sources, norm, time_shift_groups,
     return results
 
 
+def _misfit_kernel(data_data, greens_data, greens_greens, sources, groups,
+    weights, hybrid_norm, dt, npad):
+    # same algorithm as the C extension, except that sources are distributed
+    # over threads and no progress messages are displayed
+    nsrc, ng = sources.shape
+    nsta, nc = weights.shape
+    ngrp = groups.shape[0]
+
+    results = np.zeros((nsrc, 1))
+
+    for isrc in numba.prange(nsrc):
+        cc = np.empty(npad)
+        L2_sum = 0.
+
+        for ista in range(nsta):
+            for igrp in range(ngrp):
+
+                # finds the time shift that maximizes cross-correlation
+                # summed over all components in the group
+                cc[:] = 0.
+                for ic in range(nc):
+                    if groups[igrp, ic]==0. or abs(weights[ista, ic]) < 1.e-6:
+                        continue
+                    for ig in range(ng):
+                        for it in range(npad):
+                            cc[it] += greens_data[ista, ic, ig, it] *\
+                                sources[isrc, ig]
+                itpad = np.argmax(cc)
+
+                # ||s - d||^2 = s^2 + d^2 - 2sd
+                for ic in range(nc):
+                    if groups[igrp, ic]==0. or abs(weights[ista, ic]) < 1.e-6:
+                        continue
+                    L2_tmp = data_data[ista, ic]
+                    for j1 in range(ng):
+                        for j2 in range(ng):
+                            L2_tmp += sources[isrc, j1] * sources[isrc, j2] *\
+                                greens_greens[ista, ic, itpad, j1, j2]
+                    for ig in range(ng):
+                        L2_tmp -= 2.*greens_data[ista, ic, ig, itpad] *\
+                            sources[isrc, ig]
+
+                    if hybrid_norm==0:
+                        L2_sum += dt * weights[ista, ic] * L2_tmp
+                    else:
+                        L2_sum += dt * weights[ista, ic] * L2_tmp**0.5
+
+        results[isrc, 0] = L2_sum
+
+    return results
+
+
+if numba is not None:
+    _misfit_numba = numba.njit(parallel=True, fastmath=True, cache=True)(
+        _misfit_kernel)
+
+
+def _misfit_batched(data_data, greens_data, greens_greens, sources, groups,
+    weights, hybrid_norm, dt, xp=np, batch_size=None):
+    # same algorithm as the C extension, except that all sources in a batch
+    # are handled at once through matrix products, which suits GPU array
+    # modules such as CuPy (xp=cupy) as well as NumPy
+    nsrc, ng = sources.shape
+    nsta, nc, _, npad = greens_data.shape
+
+    if batch_size is None:
+        # keeps each of the two (batch, nsta, nc, npad) intermediate arrays
+        # below about 256 MB in double precision
+        batch_size = max(1, 2**25//(nsta*nc*npad))
+
+    # which components contribute to each time shift group?
+    masks = [xp.asarray((group != 0.) & (np.abs(weights) >= 1.e-6))
+        for group in groups]
+
+    data_data = xp.asarray(data_data)
+    weights = xp.asarray(weights)
+
+    # flattened so that each batch reduces to two matrix products
+    greens_data = xp.asarray(
+        greens_data.transpose(2, 0, 1, 3).reshape(ng, -1))
+    greens_greens = xp.asarray(
+        greens_greens.transpose(3, 4, 0, 1, 2).reshape(ng*ng, -1))
+
+    results = xp.zeros((nsrc, 1))
+
+    for start in range(0, nsrc, batch_size):
+        batch = xp.asarray(sources[start:start+batch_size])
+        nb = batch.shape[0]
+
+        # source-data and source-source terms for every possible time shift
+        sd = xp.matmul(batch, greens_data).reshape(nb, nsta, nc, npad)
+        ss = xp.matmul(
+            (batch[:, :, None]*batch[:, None, :]).reshape(nb, ng*ng),
+            greens_greens).reshape(nb, nsta, nc, npad)
+
+        for mask in masks:
+            # finds the time shift that maximizes cross-correlation
+            # summed over all components in the group
+            cc = (sd*mask[None, :, :, None]).sum(axis=2)
+            itpad = xp.argmax(cc, axis=-1)[:, :, None, None]
+
+            # ||s - d||^2 = s^2 + d^2 - 2sd
+            L2 = data_data[None, :, :] +\
+                xp.take_along_axis(ss, itpad, axis=-1)[..., 0] -\
+                2.*xp.take_along_axis(sd, itpad, axis=-1)[..., 0]
+
+            if hybrid_norm==1:
+                L2 = L2**0.5
+
+            results[start:start+nb, 0] += dt*xp.where(
+                mask, weights*L2, 0.).sum(axis=(1, 2))
+
+    if xp is not np:
+        results = results.get()
+
+    return results
+
+
 #
 # utility functions
 #
@@ -283,23 +417,23 @@ def _check(data, greens, sources):
 
 def _to_array(sources):
     dims = sources.dims
-    df = sources.to_dataframe()
+    df = dict(zip(dims, sources.to_array().T))
 
     if _type(dims)=='MomentTensor':
         return np.ascontiguousarray(to_mij(
-            df['rho'].to_numpy(),
-            df['v'].to_numpy(),
-            df['w'].to_numpy(),
-            df['kappa'].to_numpy(),
-            df['sigma'].to_numpy(),
-            df['h'].to_numpy(),
+            df['rho'],
+            df['v'],
+            df['w'],
+            df['kappa'],
+            df['sigma'],
+            df['h'],
             ))
 
     elif _type(dims)=='Force':
         return np.ascontiguousarray(to_rtp(
-            df['F0'].to_numpy(),
-            df['phi'].to_numpy(),
-            df['h'].to_numpy(),
+            df['F0'],
+            df['phi'],
+            df['h'],
             ))
 
 
@@ -325,6 +459,47 @@ def _type(dims):
 # cross-correlation utilities
 #
 
+# Cross-correlations depend on data, Green's functions and time shift bounds
+# but not on sources, so they are kept for reuse by subsequent calls (for
+# example, when the same grid search is split into many chunks). Green's
+# functions are identified by the individual tensors rather than by the
+# containing list, since `GreensTensorList.select` returns a new list on every
+# call but the same tensors. Data and Green's functions are identified by
+# object identity only, so containers modified in-place between calls should
+# be copied first
+_cache = OrderedDict()
+_cache_size = 4
+
+
+def _get_correlations(data, greens, stations, components, padding):
+    # returns cross-correlations from cache if available, otherwise
+    # collapses main structures into NumPy arrays and cross-correlates them
+    key = (id(data), tuple(map(id, greens)), tuple(padding), tuple(components))
+
+    if key in _cache:
+        data_ref, greens_refs, corr = _cache[key]
+        if data_ref() is data and all(
+            ref() is tensor for ref, tensor in zip(greens_refs, greens)):
+            _cache.move_to_end(key)
+            return corr
+
+    data_array = _get_data(data, stations, components)
+    greens_array = _get_greens(greens, stations, components)
+
+    corr = (
+        _autocorr_1(data_array),
+        _corr_1_2(data_array, greens_array, padding),
+        _autocorr_2(greens_array, padding),
+        )
+
+    _cache[key] = (
+        weakref.ref(data), [weakref.ref(tensor) for tensor in greens], corr)
+    while len(_cache) > _cache_size:
+        _cache.popitem(last=False)
+
+    return corr
+
+
 def _corr_1_2(data, greens, padding):
     # correlates 1D and 2D data structures
     Ncomponents = greens.shape[1]
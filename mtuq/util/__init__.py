@@ -9,7 +9,11 @@ from retry import retry
 
 import copy
 import csv
+import hashlib
 import json
+import os
+import pickle
+import shutil
 import time
 import numpy as np
 import obspy
@@ -41,10 +45,11 @@ def asarray(x):
 
 
 def gather2(comm, array):
-    """ Gathers 2-D NumPy arrays and combines along first dimension
+    """ Gathers 1-D or 2-D NumPy arrays and combines along first dimension
 
     For very large numbers of elements, provides improved performance over 
-    `gather` by using the lower-level function `Gatherv`
+    `gather` by using the lower-level function `Gatherv`, which receives
+    directly into a preallocated buffer without pickling
     """
     from mpi4py import MPI
 
@@ -61,32 +66,251 @@ def gather2(comm, array):
     else:
         raise NotImplementedError
 
-    if array.ndim!=2:
+    if array.ndim not in (1, 2):
         raise NotImplementedError
 
     # TODO - how to enforce same ncol for all processes?
-    nrow, ncol = array.shape
+    ncol = array.shape[1] if array.ndim==2 else 1
+    array = np.ascontiguousarray(array)
 
 
     # start by defining the memory block sizes and create receiving buffer
-    sendcounts = np.array(comm.gather(np.size(array), root=0))
+    sendcount = np.array([array.size], dtype=np.int64)
 
     if comm.rank == 0:
-        recvbuf = np.empty(sum(sendcounts), dtype=array.dtype)
+        sendcounts = np.empty(comm.size, dtype=np.int64)
     else:
-        recvbuf = None
+        sendcounts = None
+
+    comm.Gather(
+        sendbuf=(sendcount, MPI.INT64_T),
+        recvbuf=(sendcounts, MPI.INT64_T),
+        root=0)
+
+    if comm.rank == 0:
+        displacements = np.zeros(comm.size, dtype=np.int64)
+        displacements[1:] = np.cumsum(sendcounts)[:-1]
+        recvbuf = np.empty(sendcounts.sum(), dtype=array.dtype)
+        recvspec = (recvbuf, sendcounts, displacements, mpi_type)
+    else:
+        recvspec = None
 
     comm.Gatherv(
         sendbuf=(array, mpi_type),
-        recvbuf=(recvbuf, sendcounts, None, mpi_type),
+        recvbuf=recvspec,
         root=0)
 
-    if comm.rank == 0:
+    if comm.rank == 0 and array.ndim == 1:
+        return recvbuf
+    elif comm.rank == 0:
         return recvbuf.reshape(int(len(recvbuf)/ncol),ncol)
     else:
         return
 
 
+def scatter2(comm, array, root=0):
+    """ Scatters 2-D NumPy array along first dimension
+
+    Counterpart of `gather2`. Rows are divided as evenly as possible, in the
+    same way as `Grid.partition`, and sent using the lower-level function
+    `Scatterv`, which sends directly from a contiguous buffer without pickling
+    """
+    from mpi4py import MPI
+
+    if comm.rank == root:
+        if not isinstance(array, np.ndarray) or array.ndim != 2:
+            raise NotImplementedError
+        array = np.ascontiguousarray(array)
+        header = (array.shape, array.dtype)
+    else:
+        header = None
+
+    (nrow, ncol), dtype = comm.bcast(header, root=root)
+
+    if dtype=="float32":
+        mpi_type = MPI.FLOAT
+
+    elif dtype=="float64":
+        mpi_type = MPI.DOUBLE
+
+    else:
+        raise NotImplementedError
+
+    bounds = [int(iproc*nrow/comm.size) for iproc in range(comm.size+1)]
+    sendcounts = ncol*np.diff(bounds)
+    displacements = ncol*np.array(bounds[:-1])
+
+    recvbuf = np.empty(
+        (bounds[comm.rank+1]-bounds[comm.rank], ncol), dtype=dtype)
+
+    if comm.rank == root:
+        sendspec = (array, sendcounts, displacements, mpi_type)
+    else:
+        sendspec = None
+
+    comm.Scatterv(
+        sendbuf=sendspec,
+        recvbuf=(recvbuf, mpi_type),
+        root=root)
+
+    return recvbuf
+
+
+def bcast2(comm, container, root=0):
+    """ Broadcasts container of ObsPy streams (`Dataset` or `GreensTensorList`)
+
+    For large containers, provides improved performance over `bcast` by
+    packing numeric trace data into a single contiguous array, which is
+    broadcast using the lower-level function `Bcast`. Only the remaining
+    lightweight metadata get pickled
+
+    The buffer has the common dtype of all traces, so single precision
+    traces are broadcast at half the volume of double precision traces
+    """
+    container, arrays, dtypes, counts = _bcast_metadata(
+        comm, container, root)
+
+    buffer = np.empty(sum(counts), dtype=_result_type(dtypes))
+    if comm.rank == root and arrays:
+        np.concatenate(arrays, out=buffer)
+
+    # MPI datatype is inferred from the buffer
+    comm.Bcast(buffer, root=root)
+
+    if comm.rank != root:
+        _set_views(_get_traces(container), buffer, dtypes, counts)
+
+    return container
+
+
+def bcast_shared(comm, container, root=0):
+    """ Broadcasts container of ObsPy streams into node-local shared memory
+
+    Like `bcast2`, except that numeric trace data are received only once per
+    compute node, into a shared memory window which is then accessed directly
+    by all processes on the node. Memory usage per node therefore no longer
+    grows with the number of processes
+
+    Trace data of the returned container are read-only views into the
+    shared memory window. All traces must have the same dtype, since
+    converting them would give each process its own copy
+
+    The window stays allocated until `free_shared` is called on the returned
+    container
+    """
+    from mpi4py import MPI
+
+    container, arrays, dtypes, counts = _bcast_metadata(
+        comm, container, root)
+
+    if len(set(dtypes)) > 1:
+        raise TypeError("bcast_shared requires all traces to have the same "
+            "dtype (got %s)" % ', '.join(sorted(set(map(str, dtypes)))))
+
+    # the root process comes first, both on its own node and among the
+    # processes that receive data on behalf of their nodes
+    key = 0 if comm.rank == root else 1
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key=key)
+    leader_comm = comm.Split(0 if node_comm.rank == 0 else MPI.UNDEFINED, key)
+
+    dtype = np.dtype(_result_type(dtypes))
+    size = sum(counts)
+
+    win = MPI.Win.Allocate_shared(
+        size*dtype.itemsize if node_comm.rank == 0 else 0,
+        dtype.itemsize, comm=node_comm)
+    memory, _ = win.Shared_query(0)
+    buffer = np.ndarray(size, dtype=dtype, buffer=memory)
+
+    # the node leader writes into the window, then all processes on the
+    # node synchronize their view of it before reading (MPI unified memory
+    # model)
+    win.Lock_all(MPI.MODE_NOCHECK)
+
+    if comm.rank == root and arrays:
+        np.concatenate(arrays, out=buffer)
+
+    if leader_comm != MPI.COMM_NULL:
+        leader_comm.Bcast(buffer, root=0)
+        leader_comm.Free()
+
+    win.Sync()
+    node_comm.Barrier()
+    win.Sync()
+    win.Unlock_all()
+
+    node_comm.Free()
+
+    _shared_windows[id(container)] = win
+
+    buffer.flags.writeable = False
+    _set_views(_get_traces(container), buffer, dtypes, counts)
+
+    return container
+
+
+def free_shared(container):
+    """ Frees the shared memory window holding trace data of a container
+    returned by `bcast_shared`
+
+    Must be called by all processes that took part in the broadcast. Trace
+    data of the container are replaced by empty arrays, so that nothing
+    refers to the freed memory through the container; any other references
+    to the old trace data must no longer be used
+    """
+    win = _shared_windows.pop(id(container))
+
+    for trace in _get_traces(container):
+        trace.data = np.empty(0, dtype=trace.data.dtype)
+
+    win.Free()
+
+
+# shared memory windows allocated by `bcast_shared`, by container
+_shared_windows = {}
+
+
+def _bcast_metadata(comm, container, root):
+    # broadcasts everything except numeric trace data, which are returned
+    # separately on the root process
+    if comm.rank == root:
+        traces = _get_traces(container)
+        arrays = [trace.data for trace in traces]
+        dtypes = [array.dtype for array in arrays]
+        counts = [array.size for array in arrays]
+
+        # temporarily remove numeric trace data, so that only metadata
+        # get pickled
+        for trace in traces:
+            trace.data = np.empty(0, dtype=trace.data.dtype)
+        try:
+            comm.bcast((container, dtypes, counts), root=root)
+        finally:
+            for trace, array in zip(traces, arrays):
+                trace.data = array
+
+    else:
+        arrays = None
+        container, dtypes, counts = comm.bcast(None, root=root)
+
+    return container, arrays, dtypes, counts
+
+
+def _set_views(traces, buffer, dtypes, counts):
+    # numeric trace data become views into the given buffer
+    offsets = np.cumsum([0] + counts)
+    for _i, trace in enumerate(traces):
+        trace.data = buffer[offsets[_i]:offsets[_i+1]].astype(
+            dtypes[_i], copy=False)
+
+
+def _result_type(dtypes):
+    if dtypes:
+        return np.result_type(*dtypes)
+    else:
+        return np.float64
+
+
 def is_mpi_env():
     try:
         import mpi4py
@@ -218,6 +442,119 @@ def save_json(filename, data):
         json.dump(data, file, cls=JSONEncoder, ensure_ascii=False, indent=4)
 
 
+class _CacheKeyEncoder(JSONEncoder):
+    def default(self, obj):
+        try:
+            return super(_CacheKeyEncoder, self).default(obj)
+        except TypeError:
+            # objects such as `ProcessData` or `Wavelet` instances are
+            # identified by class name and public attributes
+            return [type(obj).__name__, {key: value
+                for key, value in vars(obj).items()
+                if not key.startswith('_')}]
+
+
+def cache_key(*args):
+    """ Returns hexadecimal digest identifying the given arguments
+
+    The digest also depends on the MTUQ source code, so that entries saved
+    before a change to the readers or to data processing are not reused
+    """
+    string = json.dumps([_code_digest(), args],
+        cls=_CacheKeyEncoder, sort_keys=True)
+    return hashlib.sha1(string.encode()).hexdigest()
+
+
+_code_digest_value = None
+
+
+def _code_digest():
+    # hashes all Python and C source files in the mtuq package
+    global _code_digest_value
+    if _code_digest_value is None:
+        sha = hashlib.sha1()
+        root = os.path.dirname(os.path.dirname(abspath(__file__)))
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(('.py', '.c')):
+                    with open(join(dirpath, filename), 'rb') as file:
+                        sha.update(filename.encode())
+                        sha.update(file.read())
+        _code_digest_value = sha.hexdigest()
+    return _code_digest_value
+
+
+def load_cache(key, cache_dir='.mtuq_cache'):
+    """ Loads containers saved by `save_cache`
+
+    Numeric trace data are memory-mapped rather than read into memory, and
+    are read-only
+
+    Raises `FileNotFoundError` if nothing has been saved under the given key
+    """
+    filename = join(cache_dir, key)
+
+    with open(filename+'.pkl', 'rb') as file:
+        obj, dtypes, counts = pickle.load(file)
+
+    buffer = np.load(filename+'.npy', mmap_mode='r')
+    _set_views(_get_traces(obj), buffer, dtypes, counts)
+
+    return obj
+
+
+def save_cache(key, obj, cache_dir='.mtuq_cache'):
+    """ Saves container of ObsPy streams (or tuple of such containers) to 
+    disk, for reuse by subsequent runs
+
+    Numeric trace data are written as a single NumPy array, and only the 
+    remaining lightweight metadata get pickled
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    filename = join(cache_dir, key)
+
+    traces = _get_traces(obj)
+    arrays = [trace.data for trace in traces]
+    dtypes = [array.dtype for array in arrays]
+    counts = [array.size for array in arrays]
+
+    buffer = np.empty(sum(counts), dtype=_result_type(dtypes))
+    if arrays:
+        np.concatenate(arrays, out=buffer)
+
+    # write to temporary files first, so that concurrent runs never read
+    # partially written files; the metadata file comes last, since its
+    # presence signals a complete entry
+    with open(filename+'.npy.tmp', 'wb') as file:
+        np.save(file, buffer)
+    os.replace(filename+'.npy.tmp', filename+'.npy')
+
+    for trace in traces:
+        trace.data = np.empty(0, dtype=trace.data.dtype)
+    try:
+        with open(filename+'.pkl.tmp', 'wb') as file:
+            pickle.dump((obj, dtypes, counts), file,
+                protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for trace, array in zip(traces, arrays):
+            trace.data = array
+    os.replace(filename+'.pkl.tmp', filename+'.pkl')
+
+
+def _get_traces(obj):
+    if isinstance(obj, tuple):
+        return [trace for item in obj for trace in _get_traces(item)]
+    else:
+        return [trace for stream in obj for trace in stream]
+
+
+def cache_cleanup(cache_dir='.mtuq_cache'):
+    """ Removes everything saved by `save_cache`
+    """
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
 def timer(func):
     """ Decorator for measuring execution time
     """
@@ -339,29 +676,24 @@ class ProgressCallback(object):
 def dataarray_idxmin(da, warnings=True):
     """ idxmin helper function
     """
-    # something similar to this has now been implemented in a beta version 
-    # of xarray
-    da = da.where(da==da.min(), drop=True).squeeze()
-    if da.size > 1:
-        if warnings:
-            warn("No unique global minimum\n")
-        while da.size > 1:
-            da = da[0]
-    return da.coords
+    return _dataarray_idx(da, np.nanmin, warnings, "minimum")
 
 
 def dataarray_idxmax(da, warnings=True):
     """ idxmax helper function
     """
-    # something similar to this has now been implemented in a beta version 
-    # of xarray
-    da = da.where(da==da.max(), drop=True).squeeze()
-    if da.size > 1:
-        if warnings:
-            warn("No unique global maximum\n")
-        while da.size > 1:
-            da = da[0]
-    return da.coords
+    return _dataarray_idx(da, np.nanmax, warnings, "maximum")
+
+
+def _dataarray_idx(da, handle, warnings, label):
+    # locates the extremum in NumPy rather than through `da.where`, which
+    # fails for Dask-backed arrays (`.values` computes them)
+    values = np.asarray(da.values)
+    indices = np.flatnonzero(values == handle(values))
+    if indices.size > 1 and warnings:
+        warn("No unique global %s\n" % label)
+    index = np.unravel_index(indices[0], values.shape)
+    return da[index].coords
 
 
 def defaults(kwargs, defaults):
@@ -10,6 +10,7 @@ from mtuq.grid_search import grid_search
 from mtuq.misfit import Misfit
 from mtuq.process_data import ProcessData
 from mtuq.util import fullpath, merge_dicts, save_json
+from mtuq.util import cache_key, load_cache, save_cache
 from mtuq.util.cap import parse_station_codes, Trapezoid
 
 
@@ -74,6 +75,7 @@ if True:
         time_shift_min=-2.,
         time_shift_max=+2.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_sw = Misfit(
@@ -81,6 +83,7 @@ if True:
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['ZR','T'],
+        jit=True,
         )
 
 
@@ -116,12 +119,31 @@ if True:
     data_sw = data.map(process_sw)
 
 
-    
-    greens = download_greens_tensors(stations, origin, model)
+    # processed Greens functions are saved to disk, so that later runs
+    # with the same stations, origin, model, wavelet and data processing
+    # parameters can skip reading and processing
+    key = cache_key(
+        stations, origin, model, wavelet, process_bw, process_sw)
 
+    try:
+        greens_bw, greens_sw = load_cache(key)
 
-    
-    greens.convolve(wavelet)
-    greens_bw = greens.map(process_bw)
-    greens_sw = greens.map(process_sw)
+    except FileNotFoundError:
+        
+        greens = download_greens_tensors(stations, origin, model)
+
+        
+        greens.convolve(wavelet)
+        greens_bw = greens.map(process_bw)
+        greens_sw = greens.map(process_sw)
+
+        # saved in single precision, so that later runs can use the
+        # memory-mapped cache files as they are
+        for container in [greens_bw, greens_sw]:
+            for stream in container:
+                for trace in stream:
+                    trace.data = np.ascontiguousarray(
+                        trace.data, dtype=np.float32)
+
+        save_cache(key, (greens_bw, greens_sw))
 
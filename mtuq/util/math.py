@@ -246,12 +246,16 @@ def to_gamma(v):
     return np.rad2deg(gamma)
 
 
+# lookup table for inverting u(beta), which has no closed-form inverse;
+# computed once rather than on every call to to_delta
+_beta0 = np.linspace(0, np.pi, 100)
+_u0 = 0.75*_beta0 - 0.5*np.sin(2.*_beta0) + 0.0625*np.sin(4.*_beta0)
+
+
 def to_delta(w):
     """ Converts from Tape2015 parameter w to lune latitude
     """
-    beta0 = np.linspace(0, np.pi, 100)
-    u0 = 0.75*beta0 - 0.5*np.sin(2.*beta0) + 0.0625*np.sin(4.*beta0)
-    beta = np.interp(3.*np.pi/8. - w, u0, beta0)
+    beta = np.interp(3.*np.pi/8. - w, _u0, _beta0)
     delta = np.rad2deg(np.pi/2. - beta)
     return delta
 
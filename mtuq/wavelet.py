@@ -1,7 +1,7 @@
 
 import warnings
 import numpy as np
-from scipy import signal
+from scipy import fft
 
 
 
@@ -81,15 +81,25 @@ class Wavelet(object):
 
     def _convolve_array(self, y, dt, mode=1):
         """ Convolves NumPy array with given wavelet
+
+        If `y` is 2-D, each row is convolved with the same wavelet in a
+        single batched call (frequency-domain implementation only)
         """
-        nt = len(y)
+        nt = np.shape(y)[-1]
         half_duration = (nt-1)*dt/2.
         w = self._evaluate_on_interval(half_duration, nt)
         w *= dt
 
         if mode==1:
-            # frequency-domain implementation
-            return signal.fftconvolve(y, w, mode='same')
+            # frequency-domain implementation, equivalent to
+            # signal.fftconvolve(y, w, mode='same', axes=-1), except that
+            # batched transforms are split among all available threads
+            n = nt + len(w) - 1
+            nfft = fft.next_fast_len(n, real=True)
+            spectrum = fft.rfft(y, nfft, axis=-1, workers=-1)*fft.rfft(w, nfft)
+            full = fft.irfft(spectrum, nfft, axis=-1, workers=-1)
+            start = (n - nt)//2
+            return full[..., start:start+nt]
 
         elif mode==2:
             # time-domain implementation
@@ -108,6 +108,11 @@ setup(
         "nose",
         #"instaseis"
     ],
+    # optional Numba-compiled misfit and binning kernels (otherwise, the C
+    # extension and pandas implementations are used)
+    extras_require={
+        "jit": ["numba"],
+    },
     ext_modules = [
         Extension(
             'mtuq.misfit.waveform.c_ext_L2', ['mtuq/misfit/waveform/c_ext_L2.c'],
@@ -12,6 +12,7 @@ from mtuq.grid_search import grid_search
 from mtuq.misfit import Misfit
 from mtuq.process_data import ProcessData
 from mtuq.util import fullpath, merge_dicts, save_json
+from mtuq.util import cache_key, load_cache, save_cache
 from mtuq.util.cap import parse_station_codes, Trapezoid
 
 
@@ -122,6 +123,23 @@ if __name__=='__main__':
 """
 
 
+Docstring_GridSearch_FullMomentTensor_CUDA="""
+if __name__=='__main__':
+    #
+    # Carries out grid search over all moment tensor parameters, evaluating
+    # misfit on a CUDA device
+    #
+    # USAGE
+    #   mpirun -n <NPROC> python GridSearch.FullMomentTensor.CUDA.py
+    #
+    # Requires CuPy; without it, misfit evaluation falls back to the
+    # C extension. All MPI processes on a node share its default CUDA
+    # device, so a small number of processes usually suffices
+    #
+
+"""
+
+
 Docstring_SerialGridSearch_DoubleCouple="""
 if __name__=='__main__':
     #
@@ -444,6 +462,7 @@ MisfitDefinitions="""
         time_shift_min=-2.,
         time_shift_max=+2.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_sw = Misfit(
@@ -451,6 +470,7 @@ MisfitDefinitions="""
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['ZR','T'],
+        jit=True,
         )
 
 """
@@ -465,6 +485,7 @@ WaveformsPolaritiesMisfit="""
         time_shift_min=-2.,
         time_shift_max=+2.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_sw = WaveformMisfit(
@@ -472,6 +493,7 @@ WaveformsPolaritiesMisfit="""
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['ZR','T'],
+        jit=True,
         )
 
     polarity_misfit = PolarityMisfit(
@@ -604,6 +626,7 @@ MisfitDefinitions_DetailedExample="""
         time_shift_min=-2.,
         time_shift_max=+2.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_rayleigh = Misfit(
@@ -611,6 +634,7 @@ MisfitDefinitions_DetailedExample="""
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['ZR'],
+        jit=True,
         )
 
     misfit_love = Misfit(
@@ -618,6 +642,7 @@ MisfitDefinitions_DetailedExample="""
         time_shift_min=-10.,
         time_shift_max=+10.,
         time_shift_groups=['T'],
+        jit=True,
         )
 
 """
@@ -735,7 +760,9 @@ Grid_BenchmarkCAP="""
 
 
 Main_GridSearch="""
+    from concurrent.futures import ThreadPoolExecutor
     from mpi4py import MPI
+    from mtuq.util import bcast2, bcast_shared
     comm = MPI.COMM_WORLD
 
 
@@ -755,18 +782,51 @@ Main_GridSearch="""
         stations = data.get_stations()
 
 
+        # processing of body waves and of longer-period waves is
+        # independent, so the two are carried out concurrently
         print('Processing data...\\n')
-        data_bw = data.map(process_bw)
-        data_sw = data.map(process_sw)
-
-
-        print('Reading Greens functions...\\n')
-        greens = download_greens_tensors(stations, origin, model)
-
-        print('Processing Greens functions...\\n')
-        greens.convolve(wavelet)
-        greens_bw = greens.map(process_bw)
-        greens_sw = greens.map(process_sw)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            data_bw, data_sw = executor.map(
+                data.map, [process_bw, process_sw])
+
+
+        # processed Greens functions are saved to disk, so that later runs
+        # with the same stations, origin, model, wavelet and data processing
+        # parameters can skip reading and processing
+        key = cache_key(
+            stations, origin, model, wavelet, process_bw, process_sw)
+
+        try:
+            greens_bw, greens_sw = load_cache(key)
+
+        except FileNotFoundError:
+            print('Reading Greens functions...\\n')
+            greens = download_greens_tensors(stations, origin, model)
+
+            print('Processing Greens functions...\\n')
+            greens.convolve(wavelet)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                greens_bw, greens_sw = executor.map(
+                    greens.map, [process_bw, process_sw])
+
+            # saved in single precision, so that later runs can use the
+            # memory-mapped cache files as they are
+            for container in [greens_bw, greens_sw]:
+                for stream in container:
+                    for trace in stream:
+                        trace.data = np.ascontiguousarray(
+                            trace.data, dtype=np.float32)
+
+            save_cache(key, (greens_bw, greens_sw))
+
+        # single precision suffices for processed waveforms and halves the
+        # volume of data broadcast to other ranks
+        for container in [data_bw, data_sw, greens_bw, greens_sw]:
+            for stream in container:
+                for trace in stream:
+                    if trace.data.dtype != np.float32:
+                        trace.data = np.ascontiguousarray(
+                            trace.data, dtype=np.float32)
 
 
     else:
@@ -777,11 +837,14 @@ Main_GridSearch="""
         greens_sw = None
 
 
+    # numeric trace data are broadcast as contiguous arrays, avoiding the
+    # overhead of pickling large containers; Greens functions, the largest
+    # of these, are held only once per node in shared memory
     stations = comm.bcast(stations, root=0)
-    data_bw = comm.bcast(data_bw, root=0)
-    data_sw = comm.bcast(data_sw, root=0)
-    greens_bw = comm.bcast(greens_bw, root=0)
-    greens_sw = comm.bcast(greens_sw, root=0)
+    data_bw = bcast2(comm, data_bw, root=0)
+    data_sw = bcast2(comm, data_sw, root=0)
+    greens_bw = bcast_shared(comm, greens_bw, root=0)
+    greens_sw = bcast_shared(comm, greens_sw, root=0)
 
 
     #
@@ -824,6 +887,57 @@ Main1_SerialGridSearch_DoubleCouple="""
     data_sw = data.map(process_sw)
 
 
+    # processed Greens functions are saved to disk, so that later runs
+    # with the same stations, origin, model, wavelet and data processing
+    # parameters can skip reading and processing
+    key = cache_key(
+        stations, origin, model, wavelet, process_bw, process_sw)
+
+    try:
+        greens_bw, greens_sw = load_cache(key)
+
+    except FileNotFoundError:
+        print('Reading Greens functions...\\n')
+        greens = download_greens_tensors(stations, origin, model)
+
+        print('Processing Greens functions...\\n')
+        greens.convolve(wavelet)
+        greens_bw = greens.map(process_bw)
+        greens_sw = greens.map(process_sw)
+
+        # saved in single precision, so that later runs can use the
+        # memory-mapped cache files as they are
+        for container in [greens_bw, greens_sw]:
+            for stream in container:
+                for trace in stream:
+                    trace.data = np.ascontiguousarray(
+                        trace.data, dtype=np.float32)
+
+        save_cache(key, (greens_bw, greens_sw))
+
+"""
+
+Main1_TestGridSearch_DoubleCouple="""
+    #
+    # The main I/O work starts now
+    #
+
+    print('Reading data...\\n')
+    data = read(path_data, format='sac',
+        event_id=event_id,
+        station_id_list=station_id_list,
+        tags=['units:cm', 'type:velocity']) 
+
+
+    data.sort_by_distance()
+    stations = data.get_stations()
+
+
+    print('Processing data...\\n')
+    data_bw = data.map(process_bw)
+    data_sw = data.map(process_sw)
+
+
     print('Reading Greens functions...\\n')
     greens = download_greens_tensors(stations, origin, model)
 
@@ -837,15 +951,30 @@ Main1_SerialGridSearch_DoubleCouple="""
 
 
 Main2_SerialGridSearch_DoubleCouple="""
+    # single precision suffices for processed waveforms and halves the
+    # volume of data passed to worker processes
+    for container in [data_bw, data_sw, greens_bw, greens_sw]:
+        for stream in container:
+            for trace in stream:
+                if trace.data.dtype != np.float32:
+                    trace.data = np.ascontiguousarray(
+                        trace.data, dtype=np.float32)
+
+
     #
     # The main computational work starts now
     #
 
+    # without MPI, the grid search can still be divided among all cores
+    # of the local machine
+
     print('Evaluating body wave misfit...\\n')
-    results_bw = grid_search(data_bw, greens_bw, misfit_bw, origin, grid)
+    results_bw = grid_search(data_bw, greens_bw, misfit_bw, origin, grid,
+        processes=os.cpu_count())
 
     print('Evaluating surface wave misfit...\\n')
-    results_sw = grid_search(data_sw, greens_sw, misfit_sw, origin, grid)
+    results_sw = grid_search(data_sw, greens_sw, misfit_sw, origin, grid,
+        processes=os.cpu_count())
 
 """
 
@@ -1685,16 +1814,20 @@ Main_BenchmarkCAP="""
 """
 
 
+def write_file(filename, parts):
+    with open(filename, 'w') as file:
+        file.write(''.join(parts))
+
+
 if __name__=='__main__':
     import os
     from mtuq.util import basepath, replace
     os.chdir(basepath())
 
 
-    with open('examples/DetailedAnalysis.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(
-            replace(
+    write_file('examples/DetailedAnalysis.py', [
+        "#!/usr/bin/env python\n",
+        replace(
             Imports,
             'DoubleCoupleGridRegular',
             'FullMomentTensorGridSemiregular',
@@ -1710,25 +1843,23 @@ if __name__=='__main__':
             ),
             'from mtuq.misfit import Misfit',
             'from mtuq.misfit.waveform import Misfit, estimate_sigma, calculate_norm_data'
-            ))
-        file.write(Docstring_DetailedAnalysis)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitComments)
-        file.write(MisfitDefinitions_DetailedExample)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(
-            replace(
+            ),
+        Docstring_DetailedAnalysis,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        MisfitDefinitions_DetailedExample,
+        WeightsComments,
+        WeightsDefinitions,
+        replace(
             Grid_FullMomentTensor,
             'npts_per_axis=10',
             'npts_per_axis=12',
-            ))
-        file.write(OriginComments)
-        file.write(OriginDefinitions)
-        file.write(
-            replace(
+            ),
+        OriginComments,
+        OriginDefinitions,
+        replace(
             Main_GridSearch,
             'surface wave',
             'Rayleigh wave',
@@ -1736,87 +1867,85 @@ if __name__=='__main__':
             'results_rayleigh',
             'misfit_sw',
             'misfit_rayleigh',
-            ))
-        file.write("""
+            ),
+        """
     if comm.rank==0:
         print('Evaluating Love wave misfit...\\n')
 
     results_love = grid_search(
-        data_sw, greens_sw, misfit_love, origin, grid)\n"""
-        )
-        file.write(WrapUp_DetailedAnalysis)
-
-
-    with open('examples/GridSearch.DoubleCouple.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(Imports)
-        file.write(Docstring_GridSearch_DoubleCouple)
-        file.write(PathsComments)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitComments)
-        file.write(MisfitDefinitions)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(Grid_DoubleCouple)
-        file.write(OriginComments)
-        file.write(OriginDefinitions)
-        file.write(Main_GridSearch)
-        file.write(WrapUp_GridSearch)
-
-
-    with open('examples/GridSearch.DoubleCouple+Magnitude+Depth.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(
-            replace(
+        data_sw, greens_sw, misfit_love, origin, grid)\n""",
+        WrapUp_DetailedAnalysis,
+        ])
+
+
+    write_file('examples/GridSearch.DoubleCouple.py', [
+        "#!/usr/bin/env python\n",
+        Imports,
+        Docstring_GridSearch_DoubleCouple,
+        PathsComments,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        MisfitDefinitions,
+        WeightsComments,
+        WeightsDefinitions,
+        Grid_DoubleCouple,
+        OriginComments,
+        OriginDefinitions,
+        Main_GridSearch,
+        WrapUp_GridSearch,
+        ])
+
+
+    write_file('examples/GridSearch.DoubleCouple+Magnitude+Depth.py', [
+        "#!/usr/bin/env python\n",
+        replace(
             Imports,
             'plot_beachball',
             'plot_misfit_depth',
-            ))
-        file.write(Docstring_GridSearch_DoubleCoupleMagnitudeDepth)
-        file.write(PathsComments)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitComments)
-        file.write(MisfitDefinitions)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(OriginsComments)
-        file.write(Origins_Depth)
-        file.write(Grid_DoubleCoupleMagnitude)
-        file.write(
-            replace(
+            ),
+        Docstring_GridSearch_DoubleCoupleMagnitudeDepth,
+        PathsComments,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        MisfitDefinitions,
+        WeightsComments,
+        WeightsDefinitions,
+        OriginsComments,
+        Origins_Depth,
+        Grid_DoubleCoupleMagnitude,
+        replace(
             Main_GridSearch,
             'origin',
             'origins',
-            ))
-        file.write(WrapUp_GridSearch_DoubleCoupleMagnitudeDepth)
+            ),
+        WrapUp_GridSearch_DoubleCoupleMagnitudeDepth,
+        ])
 
 
-    with open('examples/GridSearch.DoubleCouple+Magnitude+Hypocenter.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(
-            replace(
+    write_file('examples/GridSearch.DoubleCouple+Magnitude+Hypocenter.py', [
+        "#!/usr/bin/env python\n",
+        replace(
             Imports,
             'plot_beachball',
             'plot_misfit_latlon',
-            ))
-        file.write(Docstring_GridSearch_DoubleCoupleMagnitudeHypocenter)
-        file.write(PathsComments)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitComments)
-        file.write(MisfitDefinitions)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(OriginsComments)
-        file.write(Origins_Hypocenter)
-        file.write(Grid_DoubleCoupleMagnitude)
-        file.write(
-            replace(
+            ),
+        Docstring_GridSearch_DoubleCoupleMagnitudeHypocenter,
+        PathsComments,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        MisfitDefinitions,
+        WeightsComments,
+        WeightsDefinitions,
+        OriginsComments,
+        Origins_Hypocenter,
+        Grid_DoubleCoupleMagnitude,
+        replace(
             Main_GridSearch,
             'origin',
             'origins',
@@ -1827,9 +1956,8 @@ if __name__=='__main__':
             ),
             'download_greens_tensors\(stations, origin, model\)',
             'download_greens_tensors(stations, origin, model, verbose=True)',
-            ))
-        file.write(
-            replace(
+            ),
+        replace(
             WrapUp_GridSearch_DoubleCoupleMagnitudeDepth,
             'DC\+Z',
             'DC+XY',
@@ -1839,65 +1967,112 @@ if __name__=='__main__':
             "title=event_id, colorbar_label='L2 misfit'",
             'show_magnitudes=True, ',
             '',
-            ))
+            ),
+        ])
 
 
-    with open('examples/GridSearch.FullMomentTensor.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(
-            replace(
+    write_file('examples/GridSearch.FullMomentTensor.py', [
+        "#!/usr/bin/env python\n",
+        replace(
             Imports,
             'DoubleCoupleGridRegular',
             'FullMomentTensorGridSemiregular',
             'plot_misfit_dc',
             'plot_misfit_lune',
-            ))
-        file.write(Docstring_GridSearch_FullMomentTensor)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitComments)
-        file.write(MisfitDefinitions)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(Grid_FullMomentTensor)
-        file.write(OriginComments)
-        file.write(OriginDefinitions)
-        file.write(Main_GridSearch)
-        file.write(
-            replace(
+            ),
+        Docstring_GridSearch_FullMomentTensor,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        MisfitDefinitions,
+        WeightsComments,
+        WeightsDefinitions,
+        Grid_FullMomentTensor,
+        OriginComments,
+        OriginDefinitions,
+        Main_GridSearch,
+        replace(
             WrapUp_GridSearch,
             'DC',
             'FMT',
             'plot_misfit_dc',
             'plot_misfit_lune',
-            ))
-
-
-    with open('examples/SerialGridSearch.DoubleCouple.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(Imports)
-        file.write(Docstring_SerialGridSearch_DoubleCouple)
-        file.write(PathsComments)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitComments)
-        file.write(MisfitDefinitions)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(Grid_DoubleCouple)
-        file.write(OriginComments)
-        file.write(OriginDefinitions)
-        file.write(Main1_SerialGridSearch_DoubleCouple)
-        file.write(Main2_SerialGridSearch_DoubleCouple)
-        file.write(WrapUp_SerialGridSearch_DoubleCouple)
-
-
-    with open('examples/Waveforms+Polarities.py', 'w') as file:
-        file.write("#!/usr/bin/env python\n")
-        file.write(
-            replace(
+            ),
+        ])
+
+
+    write_file('examples/GridSearch.FullMomentTensor.CUDA.py', [
+        "#!/usr/bin/env python\n",
+        replace(
+            Imports,
+            'import os\n',
+            '',
+            'open_db, ',
+            '',
+            'DoubleCoupleGridRegular',
+            'FullMomentTensorGridSemiregular',
+            'plot_misfit_dc',
+            'plot_misfit_lune',
+            ),
+        Docstring_GridSearch_FullMomentTensor_CUDA,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        replace(
+            MisfitDefinitions,
+            'jit=True',
+            'gpu=True',
+            ),
+        WeightsComments,
+        WeightsDefinitions,
+        replace(
+            Grid_FullMomentTensor,
+            'source-time function\n',
+            'source-time function\n'
+            '    # (about one million grid points, a problem size for which GPU\n'
+            '    # misfit evaluation pays off)\n',
+            'magnitudes=\[4.4,',
+            'magnitudes=[4.3, 4.4,',
+            ),
+        OriginComments,
+        OriginDefinitions,
+        Main_GridSearch,
+        replace(
+            WrapUp_GridSearch,
+            'DC',
+            'FMT',
+            'plot_misfit_dc',
+            'plot_misfit_lune',
+            ),
+        ])
+
+
+    write_file('examples/SerialGridSearch.DoubleCouple.py', [
+        "#!/usr/bin/env python\n",
+        Imports,
+        Docstring_SerialGridSearch_DoubleCouple,
+        PathsComments,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        MisfitComments,
+        MisfitDefinitions,
+        WeightsComments,
+        WeightsDefinitions,
+        Grid_DoubleCouple,
+        OriginComments,
+        OriginDefinitions,
+        Main1_SerialGridSearch_DoubleCouple,
+        Main2_SerialGridSearch_DoubleCouple,
+        WrapUp_SerialGridSearch_DoubleCouple,
+        ])
+
+
+    write_file('examples/Waveforms+Polarities.py', [
+        "#!/usr/bin/env python\n",
+        replace(
             Imports,
             'DoubleCoupleGridRegular',
             'FullMomentTensorGridSemiregular',
@@ -1907,234 +2082,253 @@ if __name__=='__main__':
             'plot_beachball, plot_polarities',
             'from mtuq.misfit import Misfit',
             'from mtuq.misfit import WaveformMisfit, PolarityMisfit',
-            ))
-        file.write(Docstring_WaveformsPolarities)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingComments)
-        file.write(DataProcessingDefinitions)
-        file.write(WaveformsPolaritiesMisfit)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(Grid_FullMomentTensor)
-        file.write(OriginComments)
-        file.write(OriginDefinitions)
-        file.write(Main_GridSearch)
-        file.write(WrapUp_WaveformsPolarities)
-
-
-    #with open('tests/test_SPECFEM3D_SGT.py', 'w') as file:
-    #    file.write("#!/usr/bin/env python\n")
-    #    file.write(
-    #        replace(
+            ),
+        Docstring_WaveformsPolarities,
+        Paths_Syngine,
+        DataProcessingComments,
+        DataProcessingDefinitions,
+        WaveformsPolaritiesMisfit,
+        WeightsComments,
+        WeightsDefinitions,
+        Grid_FullMomentTensor,
+        OriginComments,
+        OriginDefinitions,
+        Main_GridSearch,
+        WrapUp_WaveformsPolarities,
+        ])
+
+
+    #write_file('tests/test_SPECFEM3D_SGT.py', [
+    #    "#!/usr/bin/env python\n",
+    #    replace(
     #        Imports,
     #        'DoubleCoupleGridRegular',
     #        'FullMomentTensorGridSemiregular',
     #        'plot_misfit_dc',
     #        'plot_misfit_lune',
-    #        ))
-    #    file.write(Docstring_GridSearch_FullMomentTensor)
-    #    file.write(Paths_SPECFEM3D_SGT)
-    #    file.write(DataProcessingComments)
-    #    file.write(
-    #        replace(
+    #        ),
+    #    Docstring_GridSearch_FullMomentTensor,
+    #    Paths_SPECFEM3D_SGT,
+    #    DataProcessingComments,
+    #    replace(
     #        DataProcessingDefinitions,
     #        'taup_model=model',
     #        'taup_model=taup_model',
-    #        ))
-    #    file.write(MisfitComments)
-    #    file.write(MisfitDefinitions)
-    #    file.write(WeightsComments)
-    #    file.write(WeightsDefinitions)
-    #    file.write(Grid_FullMomentTensor)
-    #    file.write(OriginComments)
-    #    file.write(OriginDefinitions_SPECFEM3D_SGT)
-    #    file.write(
-    #        replace(
+    #        ),
+    #    MisfitComments,
+    #    MisfitDefinitions,
+    #    WeightsComments,
+    #    WeightsDefinitions,
+    #    Grid_FullMomentTensor,
+    #    OriginComments,
+    #    OriginDefinitions_SPECFEM3D_SGT,
+    #    replace(
     #        Main_GridSearch,
     #        'greens = download_greens_tensors\(stations, origin, model\)',
     #        'db = open_db(path_greens, format=\'SPECFEM3D_SGT\', model=model)\n        '
     #       +'greens = db.get_greens_tensors(stations, origin)',
-    #       ))
-    #    file.write(
-    #        replace(
+    #       ),
+    #    replace(
     #        WrapUp_GridSearch,
     #        'DC',
     #        'FMT',
     #        'plot_misfit_dc',
     #        'plot_misfit_lune',
-    #        ))
+    #        ),
+    #    ])
 
 
-    with open('tests/test_grid_search_mt.py', 'w') as file:
-        file.write(Imports)
-        file.write(Docstring_TestGridSearch_DoubleCouple)
-        file.write(ArgparseDefinitions)
-        file.write(Paths_FK)
-        file.write(
-            replace(
+    write_file('tests/test_grid_search_mt.py', [
+        replace(
+            Imports,
+            'from mtuq.util import cache_key.*\n',
+            '',
+            ),
+        Docstring_TestGridSearch_DoubleCouple,
+        ArgparseDefinitions,
+        Paths_FK,
+        replace(
             DataProcessingDefinitions,
             'pick_type=.*',
             "pick_type='FK_metadata',",
             'taup_model=.*,',
             'FK_database=path_greens,',
-            ))
-        file.write(MisfitDefinitions)
-        file.write(
-            replace(
+            ),
+        replace(
+            MisfitDefinitions,
+            '        jit=True,\n',
+            '',
+            ),
+        replace(
             Grid_DoubleCouple,
             'npts.*,',
             'npts_per_axis=5,',
-            ))
-        file.write(WeightsDefinitions)
-        file.write(OriginDefinitions)
-        file.write(
-            replace(
-            Main1_SerialGridSearch_DoubleCouple,
+            ),
+        WeightsDefinitions,
+        OriginDefinitions,
+        replace(
+            Main1_TestGridSearch_DoubleCouple,
             'greens = download_greens_tensors\(stations, origin, model\)',
             'db = open_db(path_greens, format=\'FK\', model=model)\n    '
            +'greens = db.get_greens_tensors(stations, origin)',
-            ))
-        file.write(
-            replace(
+            ),
+        replace(
             Main2_SerialGridSearch_DoubleCouple,
             'origin, grid',
             'origin, grid, 0',
-            ))
-        file.write(WrapUp_TestGridSearch_DoubleCouple)
+            ),
+        WrapUp_TestGridSearch_DoubleCouple,
+        ])
 
 
-    with open('tests/test_grid_search_mt_depth.py', 'w') as file:
-        file.write(
-            replace(
+    write_file('tests/test_grid_search_mt_depth.py', [
+        replace(
             Imports,
+            'from mtuq.util import cache_key.*\n',
+            '',
             'plot_beachball',
             'plot_misfit_depth',
-            ))
-        file.write(Docstring_TestGridSearch_DoubleCoupleMagnitudeDepth)
-        file.write(ArgparseDefinitions)
-        file.write(Paths_FK)
-        file.write(
-            replace(
+            ),
+        Docstring_TestGridSearch_DoubleCoupleMagnitudeDepth,
+        ArgparseDefinitions,
+        Paths_FK,
+        replace(
             DataProcessingDefinitions,
             'pick_type=.*',
             "pick_type='FK_metadata',",
             'taup_model=.*,',
             'FK_database=path_greens,',
-            ))
-        file.write(MisfitDefinitions)
-        file.write(WeightsDefinitions)
-        file.write(Grid_TestDoubleCoupleMagnitudeDepth)
-        file.write(Main_TestGridSearch_DoubleCoupleMagnitudeDepth)
-        file.write(WrapUp_TestGridSearch_DoubleCoupleMagnitudeDepth)
+            ),
+        replace(
+            MisfitDefinitions,
+            '        jit=True,\n',
+            '',
+            ),
+        WeightsDefinitions,
+        Grid_TestDoubleCoupleMagnitudeDepth,
+        Main_TestGridSearch_DoubleCoupleMagnitudeDepth,
+        WrapUp_TestGridSearch_DoubleCoupleMagnitudeDepth,
+        ])
 
 
-    with open('tests/test_misfit.py', 'w') as file:
-        file.write(
-            replace(
+    write_file('tests/test_misfit.py', [
+        replace(
             Imports,
-            ))
-        file.write(Docstring_TestMisfit)
-        file.write(Paths_FK)
-        file.write(
-            replace(
+            'from mtuq.util import cache_key.*\n',
+            '',
+            ),
+        Docstring_TestMisfit,
+        Paths_FK,
+        replace(
             DataProcessingDefinitions,
             'pick_type=.*',
             "pick_type='FK_metadata',",
             'taup_model=.*,',
             'FK_database=path_greens,',
-            ))
-        file.write(MisfitDefinitions)
-        file.write(WeightsComments)
-        file.write(WeightsDefinitions)
-        file.write(
-            replace(
+            ),
+        replace(
+            MisfitDefinitions,
+            '        jit=True,\n',
+            '',
+            ),
+        WeightsComments,
+        WeightsDefinitions,
+        replace(
             Grid_DoubleCouple,
             'npts.*,',
             'npts_per_axis=5,',
-            ))
-        file.write(OriginDefinitions)
-        file.write(
-            replace(
-            Main1_SerialGridSearch_DoubleCouple,
+            ),
+        OriginDefinitions,
+        replace(
+            Main1_TestGridSearch_DoubleCouple,
             'greens = download_greens_tensors\(stations, origin, model\)',
             'db = open_db(path_greens, format=\'FK\', model=model)\n    '
            +'greens = db.get_greens_tensors(stations, origin)',
-            ))
-        file.write(Main_TestMisfit)
+            ),
+        Main_TestMisfit,
+        ])
 
 
-    with open('tests/benchmark_cap_vs_mtuq.py', 'w') as file:
-        file.write(
-            replace(
+    write_file('tests/benchmark_cap_vs_mtuq.py', [
+        replace(
             Imports,
+            'from mtuq.util import cache_key.*\n',
+            '',
             'Origin',
             'MomentTensor',
             'syngine',
             'fk',
             'plot_data_greens2',
             'plot_waveforms2',
-            ))
-        file.write(Docstring_BenchmarkCAP)
-        file.write(ArgparseDefinitions)
-        file.write(Paths_BenchmarkCAP)
-        file.write(
-            replace(
+            ),
+        Docstring_BenchmarkCAP,
+        ArgparseDefinitions,
+        Paths_BenchmarkCAP,
+        replace(
             Paths_FK,
             'data/examples/20090407201255351/weights.dat',
             'data/tests/benchmark_cap/20090407201255351/weights.dat',
-            ))
-        file.write(
-            replace(
+            ),
+        replace(
             DataProcessingDefinitions,
             'pick_type=.*',
             "pick_type='FK_metadata',",
             'taup_model=.*,',
             'FK_database=path_greens,',
-            ))
-        file.write(
-            replace(
+            ),
+        replace(
             MisfitDefinitions,
             'time_shift_max=.*',
             'time_shift_max=0.,',
-            ))
-        file.write(Grid_BenchmarkCAP)
-        file.write(Main_BenchmarkCAP)
+            '        jit=True,\n',
+            '',
+            ),
+        Grid_BenchmarkCAP,
+        Main_BenchmarkCAP,
+        ])
 
 
-    with open('tests/test_graphics.py', 'w') as file:
-        file.write(Imports)
-        file.write(Docstring_TestGraphics)
-        file.write(Paths_FK)
-        file.write(
-            replace(
+    write_file('tests/test_graphics.py', [
+        replace(
+            Imports,
+            'from mtuq.util import cache_key.*\n',
+            '',
+            ),
+        Docstring_TestGraphics,
+        Paths_FK,
+        replace(
             DataProcessingDefinitions,
             'pick_type=.*',
             "pick_type='FK_metadata',",
             'taup_model=.*,',
             'FK_database=path_greens,',
-            ))
-        file.write(MisfitDefinitions)
-        file.write(Grid_TestGraphics)
-        file.write(Main_TestGraphics)
-
-
-    with open('mtuq/util/gallery.py', 'w') as file:
-        file.write(Imports)
-        file.write(Docstring_Gallery)
-        file.write(Paths_Syngine)
-        file.write(DataProcessingDefinitions)
-        file.write(MisfitDefinitions)
-        file.write(
-            replace(
+            ),
+        replace(
+            MisfitDefinitions,
+            '        jit=True,\n',
+            '',
+            ),
+        Grid_TestGraphics,
+        Main_TestGraphics,
+        ])
+
+
+    write_file('mtuq/util/gallery.py', [
+        Imports,
+        Docstring_Gallery,
+        Paths_Syngine,
+        DataProcessingDefinitions,
+        MisfitDefinitions,
+        replace(
             Grid_DoubleCouple,
             'npts.*',
             'npts_per_axis=10,',
-            ))
-        file.write(
-            replace(
+            ),
+        replace(
             Main1_SerialGridSearch_DoubleCouple,
             'print.*',
             '',
-            ))
+            ),
+        ])
 
 
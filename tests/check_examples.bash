@@ -10,6 +10,7 @@ FILENAMES="\
     ../examples/GridSearch.DoubleCouple.py\
     ../examples/GridSearch.DoubleCouple+Magnitude+Depth.py\
     ../examples/GridSearch.FullMomentTensor.py\
+    ../examples/GridSearch.FullMomentTensor.CUDA.py\
     ../examples/SerialGridSearch.DoubleCouple.py\
     ../examples/Waveforms+Polarities.py\
     ../tests/benchmark_cap_vs_mtuq.py\
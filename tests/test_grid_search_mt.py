@@ -140,15 +140,30 @@ if __name__=='__main__':
     greens_sw = greens.map(process_sw)
 
 
+    # single precision suffices for processed waveforms and halves the
+    # volume of data passed to worker processes
+    for container in [data_bw, data_sw, greens_bw, greens_sw]:
+        for stream in container:
+            for trace in stream:
+                if trace.data.dtype != np.float32:
+                    trace.data = np.ascontiguousarray(
+                        trace.data, dtype=np.float32)
+
+
     #
     # The main computational work starts now
     #
 
+    # without MPI, the grid search can still be divided among all cores
+    # of the local machine
+
     print('Evaluating body wave misfit...\n')
-    results_bw = grid_search(data_bw, greens_bw, misfit_bw, origin, grid, 0)
+    results_bw = grid_search(data_bw, greens_bw, misfit_bw, origin, grid, 0,
+        processes=os.cpu_count())
 
     print('Evaluating surface wave misfit...\n')
-    results_sw = grid_search(data_sw, greens_sw, misfit_sw, origin, grid, 0)
+    results_sw = grid_search(data_sw, greens_sw, misfit_sw, origin, grid, 0,
+        processes=os.cpu_count())
 
 
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas
+
+from mtuq.event import Origin
+from mtuq.graphics import plot_likelihood_vw, plot_misfit_vw, uq
+from mtuq.grid import FullMomentTensorGridSemiregular, Grid
+from mtuq.grid_search import _to_dataarray, open_ds
+
+
+class TestBin2d(unittest.TestCase):
+
+    @unittest.skipIf(uq.numba is None, "Numba not installed")
+    def test_numba_pandas(self):
+        """ Checks compiled binning kernel against pandas implementation
+        """
+        rng = np.random.default_rng(0)
+        edges_x = np.linspace(-1., 1., 11)
+        edges_y = np.linspace(0., 2., 21)
+
+        # includes points outside the binned region, points on cell edges,
+        # NaN values and empty cells
+        x = rng.uniform(-1.2, 1.2, 5000)
+        y = rng.uniform(-0.2, 1.6, 5000)
+        x[:50] = edges_x[rng.integers(0, len(edges_x), 50)]
+        y[50:100] = edges_y[rng.integers(0, len(edges_y), 50)]
+        values = rng.standard_normal(5000)
+        values[::37] = np.nan
+
+        for op, handle in enumerate(uq._bin2d_ops):
+            expected, nonempty = uq._bin2d_pandas(
+                x, y, values, edges_x, edges_y, handle)
+
+            result, counts = uq._bin2d_numba(
+                x, y, values, edges_x, edges_y, op, 4)
+
+            assert np.count_nonzero(counts) == nonempty
+            assert np.allclose(result, expected, rtol=1.e-12, equal_nan=True)
+
+
+class TestLikelihoods(unittest.TestCase):
+
+    def test_marginal_nan(self):
+        """ Checks that NaN misfit values are skipped when marginalizing
+        """
+        import dask.array
+        import xarray
+
+        rng = np.random.default_rng(0)
+        values = 100.*rng.random((4, 5, 6))
+        values[0, 1, 2] = np.nan
+        values[1, :, :] = np.nan
+
+        da = xarray.DataArray(values, dims=('x', 'y', 'z'),
+            coords=[np.arange(4.), np.arange(5.), np.arange(6.)])
+
+        # reference: sum of likelihoods, with NaN values skipped by xarray
+        expected = np.exp(-da/(2.*10.)).sum(('y', 'z')).values
+        expected /= expected.max()
+
+        for data in [values, dask.array.from_array(values, chunks=2)]:
+            result = uq._marginal_likelihoods(
+                da.copy(data=data), 10., ('y', 'z'))
+
+            assert np.all(np.isfinite(result.values))
+            assert result.values[1] == 0.
+            assert np.allclose(result.values, expected, rtol=1.e-12)
+
+
+class TestRegular(unittest.TestCase):
+
+    def test_as_regular(self):
+        """ Checks reshaping of DataFrames tagged by Grid.to_dataframe
+        """
+        grid = Grid(dims=('x', 'y'), coords=(np.arange(3.), np.arange(4.)))
+        values = np.random.default_rng(0).random(grid.size)
+        df = grid.to_dataframe(values)
+
+        da = uq._as_regular(df)
+        assert da.dims == ('x', 'y', 'origin_idx')
+        assert np.array_equal(da.values[:, :, 0], values.reshape(3, 4))
+
+        # reordered rows are binned rather than reshaped
+        df_sorted = df.sort_values('values')
+        assert df_sorted.attrs['regular']
+        assert uq._as_regular(df_sorted) is df_sorted
+
+
+    def test_concat(self):
+        """ Checks that tagged DataFrames can be concatenated
+        """
+        grids = [Grid(dims=('x', 'y'), coords=(np.arange(3.), np.arange(4.)))
+            for _ in range(2)]
+
+        # recent versions of pandas compare attrs when concatenating
+        assert grids[0].to_dataframe().attrs == grids[1].to_dataframe().attrs
+
+        df = pandas.concat([grid.to_dataframe() for grid in grids])
+
+        assert len(df) == 2*grids[0].size
+        assert uq._as_regular(df) is df
+
+
+class TestLazyResults(unittest.TestCase):
+
+    def test_plot_vw(self):
+        """ Checks plotting of grid search results read with Dask
+        """
+        import matplotlib
+        matplotlib.use('Agg')
+
+        origins = [Origin({'time': '2000-01-01T00:00:00', 'latitude': 0.,
+            'longitude': 0., 'depth_in_m': 1000.})]
+        sources = FullMomentTensorGridSemiregular(
+            npts_per_axis=4, magnitudes=[4.5])
+        values = np.random.default_rng(0).random((sources.size, 1))
+
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'misfit.nc')
+            _to_dataarray(origins, sources, values).save(filename)
+
+            for chunks in [{}, {'v': 2}]:
+                ds = open_ds(filename, format='NetCDF', chunks=chunks)
+                assert ds.chunks is not None
+
+                plot_misfit_vw(os.path.join(dirname, 'misfit_vw.png'), ds)
+                plot_likelihood_vw(
+                    os.path.join(dirname, 'likelihood_vw.png'), ds, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+
+import unittest
+import numpy as np
+
+from mtuq.misfit.waveform import level2
+
+
+def _random_inputs(nsta=5, nc=3, ng=6, padding=(10, 10), nsrc=200, seed=0):
+    # random cross-correlation tables with the shapes expected by the
+    # level2 misfit backends
+    rng = np.random.default_rng(seed)
+    npad = padding[0]+padding[1]+1
+
+    data_data = 1000. + 100.*rng.random((nsta, nc))
+    greens_data = rng.standard_normal((nsta, nc, ng, npad))
+    greens_greens = rng.random((nsta, nc, npad, ng, ng))
+    sources = rng.standard_normal((nsrc, ng))
+    groups = np.array([[1., 1., 0.], [0., 0., 1.]])
+    weights = rng.random((nsta, nc))
+    weights[1, 2] = 0.
+
+    return data_data, greens_data, greens_greens, sources, groups, weights
+
+
+def _c_ext(inputs, hybrid_norm, dt, padding):
+    return level2.c_ext_L2.misfit(*inputs, hybrid_norm, dt,
+        padding[0], padding[1], 0, 0, 0, 0)
+
+
+class TestLevel2(unittest.TestCase):
+
+    @unittest.skipIf(level2.numba is None, "Numba not installed")
+    def test_jit(self):
+        """ Checks Numba kernel against C extension
+        """
+        padding = (10, 10)
+        inputs = _random_inputs(padding=padding)
+
+        for hybrid_norm in [0, 1]:
+            expected = _c_ext(inputs, hybrid_norm, 0.1, padding)
+            result = level2._misfit_numba(*inputs, hybrid_norm, 0.1,
+                padding[0]+padding[1]+1)
+
+            assert np.allclose(result, expected, rtol=1.e-10)
+
+
+    def test_batched(self):
+        """ Checks batched array-module kernel (run with NumPy) against C
+        extension
+        """
+        padding = (10, 10)
+        inputs = _random_inputs(padding=padding)
+
+        for hybrid_norm in [0, 1]:
+            expected = _c_ext(inputs, hybrid_norm, 0.1, padding)
+
+            # batches that do and do not evenly divide the sources
+            for batch_size in [None, 64]:
+                result = level2._misfit_batched(*inputs, hybrid_norm, 0.1,
+                    xp=np, batch_size=batch_size)
+
+                assert result.shape == expected.shape
+                assert np.allclose(result, expected, rtol=1.e-10)
+
+
+    @unittest.skipIf(level2.cupy is None, "CuPy not installed")
+    def test_gpu(self):
+        """ Checks batched array-module kernel (run on CUDA device) against C
+        extension
+        """
+        padding = (10, 10)
+        inputs = _random_inputs(padding=padding)
+
+        for hybrid_norm in [0, 1]:
+            expected = _c_ext(inputs, hybrid_norm, 0.1, padding)
+            result = level2._misfit_batched(*inputs, hybrid_norm, 0.1,
+                xp=level2.cupy, batch_size=64)
+
+            assert type(result) is np.ndarray
+            assert np.allclose(result, expected, rtol=1.e-10)
+
+
+if __name__ == '__main__':
+    unittest.main()
+